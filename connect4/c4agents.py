@@ -0,0 +1,181 @@
+#connect4 players without any GUI, used by the scripts and gamecore.runner
+#
+# an agent picks a column for game.current_player with select_move(game) and
+# gets game_over(game, winner) once the game has ended (winner is None on a draw).
+import os
+import pickle
+import random
+from c4board import mirror_column
+from c4search import MinimaxSearch, AlphaBetaSearch, MOVE_TIME
+from c4mcts import MCTS
+from c4parallel import ParallelSearch
+from c4qtable import QStore, MappedQStore
+from c4linear import LinearQ, game_features
+from gamecore.qfile import read_q_file, write_q_file
+from gamecore.trajectory import Trajectory
+
+Q_TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'q_table.qtab')
+Q_TABLE_MB = 16  # memory cap of the Q-learning store
+
+
+class Agent:
+    def __init__(self):
+        self.total_time = 0.0  # time spent in select_move, kept by gamecore.engine
+        self.move_count = 0
+
+    def select_move(self, game):
+        raise NotImplementedError
+
+    def game_over(self, game, winner):
+        pass
+
+
+class RandomAgent(Agent):
+    def select_move(self, game):
+        return random.choice(game.valid_moves())
+
+
+class BasicAgent(Agent):
+    # win if possible, otherwise block the opponent, otherwise play randomly
+    def select_move(self, game):
+        player = game.current_player
+        opponent = game.player2 if player == game.player1 else game.player1
+        for col in range(game.columns):
+            if game.is_winning_move(col, player):
+                return col
+        for col in range(game.columns):
+            if game.is_winning_move(col, opponent):
+                return col
+        return random.choice(game.valid_moves())
+
+
+class MinimaxAgent(Agent):
+    def __init__(self, depth=3, evaluator=None):
+        super().__init__()
+        self.search = MinimaxSearch(depth, evaluator)
+
+    def select_move(self, game):
+        return self.search.best_move(game)
+
+
+class AlphaBetaAgent(Agent):
+    def __init__(self, time_limit=MOVE_TIME, depth=None, **search_options):
+        super().__init__()
+        self.time_limit = time_limit
+        self.depth = depth  # fixed depth instead of the time limit
+        self.search = AlphaBetaSearch(**search_options)
+        self.depths = []
+
+    def select_move(self, game):
+        column, depth = self.search.best_move(game, self.time_limit, self.depth)
+        self.depths.append(depth)
+        return column
+
+
+class MCTSAgent(Agent):
+    # UCT search for time_limit seconds (or a fixed number of iterations) per
+    # move, the tree is reused between the moves of a game
+    def __init__(self, time_limit=MOVE_TIME, iterations=None, **search_options):
+        super().__init__()
+        self.time_limit = time_limit
+        self.iterations = iterations
+        self.search = MCTS(**search_options)
+
+    def select_move(self, game):
+        return self.search.best_move(game, self.time_limit, self.iterations)
+
+    def game_over(self, game, winner):
+        self.search.reset()
+
+
+class ParallelAgent(Agent):
+    # c4parallel search on a process pool of `workers` processes (all cores by
+    # default), call close() to stop the pool
+    def __init__(self, workers=None, mode='alphabeta', time_limit=MOVE_TIME, depth=None, **search_options):
+        super().__init__()
+        self.time_limit = time_limit
+        self.depth = depth  # fixed depth (alphabeta) or iterations per tree (mcts)
+        self.search = ParallelSearch(workers, mode, **search_options)
+
+    def select_move(self, game):
+        return self.search.best_move(game, self.time_limit, self.depth)
+
+    def close(self):
+        self.search.close()
+
+
+class QLearningAgent(Agent):
+    # learn=True records the moves of every game and replays them backwards
+    # into the Q-table once the game is over (see gamecore.trajectory)
+    def __init__(self, q_table=None, learning_rate=0.1, discount_factor=0.9, epsilon=0.1, learn=True,
+                 monte_carlo=False):
+        super().__init__()
+        self.q_table = q_table if q_table is not None else QStore(Q_TABLE_MB)
+        self.learning_rate = learning_rate
+        self.discount_factor = discount_factor
+        self.epsilon = epsilon  # Exploration rate
+        self.learn = learn  # False only plays from the table, needed for a MappedQStore
+        self.monte_carlo = monte_carlo  # replay towards the return instead of TD targets
+        self.trajectories = {}  # player -> Trajectory, two of them in self-play
+
+    def select_move(self, game):
+        # mirrored positions share one entry, Q-values of a mirrored key are stored right to left
+        state, mirrored = game.canonical_key()
+        if random.random() < self.epsilon:
+            # Randomly select action for exploration
+            column = random.choice(game.valid_moves())
+        else:
+            # Choose the playable action with the highest Q-value
+            q_values = self.q_table.get(state)
+            if mirrored:
+                q_values = q_values[::-1]
+            column = max(game.valid_moves(), key=lambda col: q_values[col])
+        if self.learn:
+            action, legal = column, game.valid_moves()
+            if mirrored:
+                action, legal = mirror_column(column), [mirror_column(col) for col in legal]
+            self.trajectories.setdefault(game.current_player, Trajectory()).record(state, action, legal)
+        return column
+
+    def game_over(self, game, winner):
+        for player, trajectory in self.trajectories.items():
+            trajectory.replay(self.q_table, self.reward(player, winner), self.learning_rate,
+                              self.discount_factor, self.monte_carlo)
+
+    def reward(self, player, winner):
+        if winner is None:
+            return 0  # Draw
+        return 1 if winner == player else -1  # Win or lose
+
+
+class LinearQAgent(Agent):
+    # plays from a c4linear model, trained with `python3 c4linear.py`
+    def __init__(self, model=None, epsilon=0.0):
+        super().__init__()
+        self.model = model if model is not None else LinearQ.load()
+        self.epsilon = epsilon
+
+    def select_move(self, game):
+        if random.random() < self.epsilon:
+            return random.choice(game.valid_moves())
+        q_values = self.model.values(game_features(game))[0]
+        return max(game.valid_moves(), key=lambda col: q_values[col])
+
+
+def save_q_table(q_table, filename=Q_TABLE_FILE):
+    write_q_file(filename, *q_table.to_arrays())
+
+
+def load_q_table(filename=Q_TABLE_FILE, max_mb=Q_TABLE_MB, mapped=False):
+    # a gamecore.qfile file, or a pickle of {key: 7 Q-values} from older versions.
+    # mapped=True returns a read-only MappedQStore over the file itself.
+    try:
+        if filename.endswith('.pickle'):
+            with open(filename, 'rb') as f:
+                return QStore.from_dict(pickle.load(f), max_mb)
+        if mapped:
+            return MappedQStore(*read_q_file(filename))
+        return QStore.from_arrays(*read_q_file(filename, mmap=False), max_mb)
+    except FileNotFoundError:
+        print("File not found. Returning empty Q-table.")
+        return QStore(max_mb)
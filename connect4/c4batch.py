@@ -0,0 +1,223 @@
+#N connect4 games on NumPy bitboards, stepped and reset together
+#
+# the boards use the c4board layout in uint64 arrays: `position` holds the
+# discs of player 1 and `mask` the discs of both players, so the bit tricks of
+# c4board and c4solver work on whole arrays at once. Boards can be reset one
+# by one, so the side to move is kept per board (1 + discs % 2).
+#
+# policies are functions (current, mask, rng) -> columns, where `current`
+# holds the discs of the side to move, e.g. basic_moves and random_moves.
+import os
+import sys
+import time
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from c4board import ROWS, COLUMNS, STRIDE, column_mask
+from c4solver import winning_cells, possible_moves
+from c4eval import WINDOWS, WINDOW_SCORES
+from gamecore.policy import random_actions, epsilon_greedy, softmax
+
+PLAYER1 = 1
+PLAYER2 = 2
+COLUMN_MASKS = np.array([column_mask(col) for col in range(COLUMNS)], dtype=np.uint64)
+# bit of every cell of Connect4.board (row 0 is the top row)
+CELL_SHIFTS = np.array([[col * STRIDE + ROWS - 1 - row for col in range(COLUMNS)] for row in range(ROWS)],
+                       dtype=np.uint64)
+
+
+def unpack_cells(bits):
+    # (N,) uint64 bitboards -> (N, 64) 0/1 cells
+    return np.unpackbits(bits.astype('<u8').view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+
+
+def aligned(bits):
+    # is_aligned for an array of bitboards
+    result = np.zeros(bits.shape, dtype=bool)
+    for shift in (STRIDE, STRIDE - 1, STRIDE + 1, 1):
+        m = bits & (bits >> np.uint64(shift))
+        result |= (m & (m >> np.uint64(2 * shift))) != 0
+    return result
+
+
+def column_bits(cells):
+    # (N, 7) bool: columns holding one of the cells
+    return (cells[:, None] & COLUMN_MASKS[None, :]) != 0
+
+
+def first_column(columns):
+    # lowest True column of every row, -1 if there is none
+    return np.where(columns.any(axis=1), columns.argmax(axis=1), -1)
+
+
+def mirror_bits(bits):
+    # c4board.mirror for an array of bitboards
+    mirrored = np.zeros_like(bits)
+    for col in range(COLUMNS):
+        column = (bits >> np.uint64(col * STRIDE)) & np.uint64((1 << STRIDE) - 1)
+        mirrored |= column << np.uint64((COLUMNS - 1 - col) * STRIDE)
+    return mirrored
+
+
+def canonical_keys(position, mask):
+    # Connect4.canonical_key() of every board: (keys, mirrored)
+    keys = position + mask
+    mirrored_keys = mirror_bits(position) + mirror_bits(mask)
+    mirrored = mirrored_keys < keys
+    return np.where(mirrored, mirrored_keys, keys), mirrored
+
+
+def random_moves(current, mask, rng):
+    # a uniformly random playable column for every board
+    return random_actions(column_bits(possible_moves(mask)), rng)
+
+
+def window_scores(current, mask):
+    # c4eval.evaluate for every board, from the point of view of `current`
+    own = unpack_cells(current)[:, WINDOWS].sum(axis=2)
+    opp = unpack_cells(current ^ mask)[:, WINDOWS].sum(axis=2)
+    return WINDOW_SCORES[own * 5 + opp].sum(axis=1)
+
+
+def basic_moves(current, mask, rng, moves=None):
+    # basic_ai on every board: win, otherwise block, otherwise random
+    possible = possible_moves(mask)
+    if moves is None:
+        moves = random_moves(current, mask, rng)
+    block = first_column(column_bits(winning_cells(current ^ mask, mask) & possible))
+    moves = np.where(block >= 0, block, moves)
+    win = first_column(column_bits(winning_cells(current, mask) & possible))
+    return np.where(win >= 0, win, moves)
+
+
+def q_policy(q_table, epsilon=0.0, ties='random', temperature=None):
+    # epsilon-greedy (or softmax with a temperature) over the playable columns
+    # from the Q-values of a c4qtable store, like QLearningAgent on every board
+    def q_moves(current, mask, rng):
+        even = unpack_cells(mask).sum(axis=1) % 2 == 0  # disc count parity, np.bitwise_count needs numpy 2
+        position = np.where(even, current, current ^ mask)  # player 1's discs
+        keys, mirrored = canonical_keys(position, mask)
+        values = q_table.batch_values(keys.astype(np.int64))
+        values[mirrored] = values[mirrored, ::-1]
+        legal = column_bits(possible_moves(mask))
+        if temperature is not None:
+            return softmax(values, legal, temperature, rng)
+        return epsilon_greedy(values, legal, epsilon, rng, ties)
+
+    return q_moves
+
+
+def window_moves(current, mask, rng):
+    # win or block like basic_moves, otherwise the move with the best window
+    # score (MinimaxAgent(depth=1) with tactics), random among equal scores
+    possible = possible_moves(mask)
+    scores = np.full((len(mask), COLUMNS), -np.inf)
+    for col in range(COLUMNS):
+        move = possible & COLUMN_MASKS[col]
+        playable = move != 0
+        scores[playable, col] = window_scores(current[playable] | move[playable], mask[playable] | move[playable])
+    scores += rng.random(scores.shape)  # below 1, the smallest score step
+    return basic_moves(current, mask, rng, scores.argmax(axis=1))
+
+
+class Connect4Batch:
+    def __init__(self, n, seed=None):
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        self.position = np.zeros(n, dtype=np.uint64)
+        self.mask = np.zeros(n, dtype=np.uint64)
+        self.discs = np.zeros(n, dtype=np.int8)
+        self.winner = np.zeros(n, dtype=np.int8)  # 0 while open or drawn
+        self.done = np.zeros(n, dtype=bool)
+
+    def reset(self, boards=None):
+        # reset the boards selected by a bool mask or index array, all boards by default
+        if boards is None:
+            boards = slice(None)
+        self.position[boards] = 0
+        self.mask[boards] = 0
+        self.discs[boards] = 0
+        self.winner[boards] = 0
+        self.done[boards] = False
+
+    def players(self):
+        return PLAYER1 + self.discs % 2
+
+    def current(self):
+        # discs of the side to move on every board
+        return np.where(self.discs % 2 == 0, self.position, self.position ^ self.mask)
+
+    def legal_mask(self):
+        # (N, 7) bool, nothing is legal on finished boards
+        return column_bits(possible_moves(self.mask)) & ~self.done[:, None]
+
+    def keys(self):
+        # Connect4.key() of every board
+        return self.position + self.mask
+
+    def observations(self):
+        # (N, 6, 7) int8 like Connect4.board: 1 and 2 for the discs, 0 for empty cells
+        player1 = (self.position[:, None, None] >> CELL_SHIFTS) & np.uint64(1)
+        filled = (self.mask[:, None, None] >> CELL_SHIFTS) & np.uint64(1)
+        return (filled * (PLAYER2 - player1)).astype(np.int8)
+
+    def step(self, actions):
+        # drop a disc for the side to move on every open board, finished boards
+        # ignore their action. Returns (rewards, dones): reward 1 for the mover
+        # when the move wins, 0 otherwise.
+        actions = np.asarray(actions)
+        active = np.flatnonzero(~self.done)
+        columns = actions[active]
+        mask = self.mask[active]
+        moves = possible_moves(mask) & COLUMN_MASKS[columns]
+        if (moves == 0).any() or (columns < 0).any():
+            raise ValueError(f"illegal moves on boards {active[moves == 0].tolist()}")
+        player1 = self.discs[active] % 2 == 0
+        mask |= moves
+        position = np.where(player1, self.position[active] | moves, self.position[active])
+        mover = np.where(player1, position, position ^ mask)
+        won = aligned(mover)
+        self.mask[active] = mask
+        self.position[active] = position
+        self.discs[active] += 1
+        self.winner[active] = np.where(won, np.where(player1, PLAYER1, PLAYER2), 0)
+        self.done[active] = won | (self.discs[active] == ROWS * COLUMNS)
+        rewards = np.zeros(self.n, dtype=np.float32)
+        rewards[active] = won
+        return rewards, self.done.copy()
+
+    def policy_actions(self, policy1, policy2):
+        # columns for every open board from the policy of its side to move
+        actions = np.zeros(self.n, dtype=np.int64)
+        players = self.players()
+        current = self.current()
+        for player, policy in ((PLAYER1, policy1), (PLAYER2, policy2)):
+            boards = np.flatnonzero(~self.done & (players == player))
+            if len(boards):
+                actions[boards] = policy(current[boards], self.mask[boards], self.rng)
+        return actions
+
+    def play(self, policy1, policy2):
+        while not self.done.all():
+            self.step(self.policy_actions(policy1, policy2))
+        return self.winner
+
+
+def play_batch(policy1, policy2, n, seed=None):
+    # winners of n games (1, 2 or 0 for a draw), player 1 moves first
+    return Connect4Batch(n, seed).play(policy1, policy2)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for name, policy1, policy2 in (('basic vs random', basic_moves, random_moves),
+                                   ('basic vs basic', basic_moves, basic_moves)):
+        start_time = time.time()
+        winner = play_batch(policy1, policy2, n, seed=0)
+        elapsed = time.time() - start_time
+        print(f"{name}: player 1 wins {np.count_nonzero(winner == PLAYER1)}, "
+              f"player 2 wins {np.count_nonzero(winner == PLAYER2)}, draws {np.count_nonzero(winner == 0)}, "
+              f"{n} games in {elapsed:.2f} seconds ({n / elapsed:,.0f} games/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#bitboard connect4 board shared by the connect4 scripts
+#
+# each column uses 7 bits (6 playable rows + 1 sentinel bit on top), so bit
+# column * 7 + row is the cell at that column, counted from the bottom row.
+# `position` holds the discs of player 1 and `mask` the discs of both players,
+# the discs of player 2 are `position ^ mask`.
+import numpy as np
+
+ROWS = 6
+COLUMNS = 7
+STRIDE = ROWS + 1
+
+BOTTOM_MASK = sum(1 << (col * STRIDE) for col in range(COLUMNS))
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+
+
+def bottom_mask(column):
+    return 1 << (column * STRIDE)
+
+
+def top_mask(column):
+    return 1 << (column * STRIDE + ROWS - 1)
+
+
+def column_mask(column):
+    return ((1 << ROWS) - 1) << (column * STRIDE)
+
+
+def mirror(bits):
+    # reflect a bitboard left to right
+    mirrored = 0
+    for col in range(COLUMNS):
+        mirrored |= ((bits >> (col * STRIDE)) & ((1 << STRIDE) - 1)) << ((COLUMNS - 1 - col) * STRIDE)
+    return mirrored
+
+
+def mirror_column(column):
+    return COLUMNS - 1 - column
+
+
+def is_aligned(bits):
+    # horizontal
+    m = bits & (bits >> STRIDE)
+    if m & (m >> (2 * STRIDE)):
+        return True
+    # diagonal \
+    m = bits & (bits >> (STRIDE - 1))
+    if m & (m >> (2 * (STRIDE - 1))):
+        return True
+    # diagonal /
+    m = bits & (bits >> (STRIDE + 1))
+    if m & (m >> (2 * (STRIDE + 1))):
+        return True
+    # vertical
+    m = bits & (bits >> 1)
+    if m & (m >> 2):
+        return True
+    return False
+
+
+class Connect4:
+    def __init__(self):
+        self.rows = ROWS
+        self.columns = COLUMNS
+        self.player1 = 1
+        self.player2 = 2
+        self.current_player = self.player1
+        self.game_over = False
+        self.moves = []
+        self.position = 0  # discs of player 1
+        self.mask = 0  # discs of both players
+        self.heights = [0] * COLUMNS
+
+    @property
+    def board(self):
+        # numpy view of the bitboards (row 0 is the top row), used by the GUIs
+        board = np.zeros((self.rows, self.columns))
+        for col in range(self.columns):
+            for row in range(self.heights[col]):
+                bit = 1 << (col * STRIDE + row)
+                board[self.rows - 1 - row][col] = self.player1 if self.position & bit else self.player2
+        return board
+
+    def copy(self):
+        other = Connect4.__new__(Connect4)
+        other.__dict__.update(self.__dict__)
+        other.moves = list(self.moves)
+        other.heights = list(self.heights)
+        return other
+
+    def key(self):
+        # unique for every position since `position` is a subset of `mask`
+        return self.position + self.mask
+
+    def canonical_key(self):
+        # (key, mirrored): a position and its left-right mirror share the smaller key
+        key = self.key()
+        mirrored_key = mirror(self.position) + mirror(self.mask)
+        if mirrored_key < key:
+            return mirrored_key, True
+        return key, False
+
+    def player_bits(self, player):
+        if player == self.player1:
+            return self.position
+        return self.position ^ self.mask
+
+    def can_play(self, column):
+        return 0 <= column < self.columns and self.heights[column] < self.rows
+
+    def valid_moves(self):
+        return [col for col in range(self.columns) if self.heights[col] < self.rows]
+
+    def drop(self, column, player):
+        bit = 1 << (column * STRIDE + self.heights[column])
+        self.heights[column] += 1
+        self.mask |= bit
+        if player == self.player1:
+            self.position |= bit
+        self.moves.append(column)
+
+    def undo(self):
+        column = self.moves.pop()
+        self.heights[column] -= 1
+        bit = 1 << (column * STRIDE + self.heights[column])
+        self.mask &= ~bit
+        self.position &= ~bit
+        return column
+
+    def check_winner(self, player):
+        return is_aligned(self.player_bits(player))
+
+    def is_winning_move(self, column, player):
+        if not self.can_play(column):
+            return False
+        bit = 1 << (column * STRIDE + self.heights[column])
+        return is_aligned(self.player_bits(player) | bit)
+
+    def is_board_full(self):
+        return self.mask == BOARD_MASK
+
+    def last_player(self):
+        # owner of the last dropped disc, None on an empty board
+        if not self.moves:
+            return None
+        column = self.moves[-1]
+        bit = 1 << (column * STRIDE + self.heights[column] - 1)
+        return self.player1 if self.position & bit else self.player2
+
+    def last_move_won(self):
+        player = self.last_player()
+        return player is not None and self.check_winner(player)
+
+    def make_move(self, column):
+        if self.game_over:
+            return False
+
+        if column is None or not self.can_play(column):
+            return False
+
+        self.drop(column, self.current_player)
+        return True
+
+    def switch_player(self):
+        if self.current_player == self.player1:
+            self.current_player = self.player2
+        else:
+            self.current_player = self.player1
@@ -0,0 +1,64 @@
+#vectorized connect4 evaluation over the 69 four-cell windows
+#
+# WINDOWS holds the bitboard indices (column * 7 + row, see c4board) of every
+# horizontal, vertical and diagonal window, so a position is scored by one
+# fancy-indexing pass instead of walking rows, columns and diagonals.
+import numpy as np
+
+from c4board import ROWS, COLUMNS, STRIDE
+
+
+def _windows():
+    windows = []
+    for col in range(COLUMNS):
+        for row in range(ROWS):
+            for dc, dr in ((1, 0), (0, 1), (1, 1), (1, -1)):
+                end_col, end_row = col + 3 * dc, row + 3 * dr
+                if end_col < COLUMNS and 0 <= end_row < ROWS:
+                    windows.append([(col + i * dc) * STRIDE + row + i * dr for i in range(4)])
+    return np.array(windows, dtype=np.intp)
+
+
+WINDOWS = _windows()  # (69, 4)
+
+# score of a window holding `own` discs of a player and `opp` discs of the other one
+WEIGHTS = {4: 1000000, 3: 100, 2: 10, 1: 1, 0: 0}
+SCORES = np.zeros((5, 5), dtype=np.int64)
+for _own in range(5):
+    SCORES[_own, 0] = WEIGHTS[_own]
+# player 1 score minus player 2 score, indexed by p1_count * 5 + p2_count
+WINDOW_SCORES = (SCORES - SCORES.T).ravel()
+
+# a decided game beats any window score, faster wins (fewer discs) score higher
+WIN_SCORE = 1000000000
+
+
+def unpack(bits):
+    # bitboard integer -> (64,) array of 0/1 cells
+    return np.unpackbits(np.frombuffer(bits.to_bytes(8, 'little'), dtype=np.uint8), bitorder='little')
+
+
+def window_counts(position, mask):
+    p1 = unpack(position)[WINDOWS].sum(axis=1)
+    p2 = unpack(position ^ mask)[WINDOWS].sum(axis=1)
+    return p1, p2
+
+
+def evaluate(position, mask):
+    # weighted 1/10/100/1000000 window score from player 1's point of view
+    p1, p2 = window_counts(position, mask)
+    return int(WINDOW_SCORES[p1 * 5 + p2].sum())
+
+
+def evaluate_board(board):
+    return evaluate(board.position, board.mask)
+
+
+def terminal_score(board):
+    # score of a won or drawn position, None while the game is still open
+    if board.last_move_won():
+        score = WIN_SCORE - len(board.moves)
+        return score if board.last_player() == board.player1 else -score
+    if board.is_board_full():
+        return 0
+    return None
@@ -0,0 +1,45 @@
+#tkinter view of a connect4 game played by two agents
+#
+# the game itself runs in gamecore.engine, the window only redraws the board
+# after every move and announces the result.
+import tkinter as tk
+from tkinter import messagebox
+from c4board import Connect4
+from gamecore.engine import play_game
+
+
+class Connect4GUI:
+    def __init__(self, master, agents):
+        self.master = master
+        self.master.title("Connect4")
+        self.connect4 = Connect4()
+        self.buttons = []
+        self.create_board()
+        self.winner = play_game(self.connect4, agents, self.update_board)
+        self.announce(self.winner)
+        self.master.quit()
+
+    def create_board(self):
+        for row in range(self.connect4.rows):
+            button_row = []
+            for col in range(self.connect4.columns):
+                button = tk.Button(self.master, text=" ", width=5, height=2)
+                button.grid(row=row, column=col)
+                button_row.append(button)
+            self.buttons.append(button_row)
+
+    def update_board(self, game=None):
+        board = self.connect4.board  # built from the bitboards on every access
+        for row in range(self.connect4.rows):
+            for col in range(self.connect4.columns):
+                player = board[row][col]
+                if player == 1:
+                    self.buttons[row][col].config(text="X", state="disabled")
+                elif player == 2:
+                    self.buttons[row][col].config(text="O", state="disabled")
+
+    def announce(self, winner):
+        if winner is not None:
+            messagebox.showinfo("Winner", f"Player {winner} wins!")
+        else:
+            messagebox.showinfo("Draw", "It's a draw!")
@@ -0,0 +1,158 @@
+#linear Q-learning for connect4 over the 69 four-cell windows
+#
+#   python3 c4linear.py [games]
+#
+# a position is described from the side to move by one-hot window patterns:
+# for every window of c4eval.WINDOWS whether it holds 1, 2 or 3 own discs and
+# nothing else, or 1, 2 or 3 discs of the opponent and nothing else, plus a
+# bias. Q(s, a) = WEIGHTS[a] . features(s), so the model has a fixed size
+# (7 x 415 floats) however long it trains, positions never seen share what
+# was learnt on their windows, and a move is one matrix-vector product.
+#
+# training plays Connect4Batch boards against an opponent policy and applies
+# semi-gradient TD(0) updates to all boards of a step at once.
+import os
+import sys
+import time
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from c4board import COLUMNS
+from c4eval import WINDOWS
+from c4batch import Connect4Batch, PLAYER1, PLAYER2, column_bits, unpack_cells, random_moves, basic_moves
+from c4solver import possible_moves
+from gamecore.policy import epsilon_greedy, greedy
+
+MODEL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'linear_q.npz')
+PATTERNS = 6  # 1-3 own discs or 1-3 opponent discs in an otherwise empty window
+FEATURES = len(WINDOWS) * PATTERNS + 1
+# pattern of a window with own * 5 + opp discs, -1 for mixed and empty windows
+PATTERN_INDEX = np.full(25, -1, dtype=np.intp)
+for _count in range(1, 4):
+    PATTERN_INDEX[_count * 5] = _count - 1
+    PATTERN_INDEX[_count] = _count + 2
+BATCH_GAMES = 1000  # boards played at once during training
+EPSILON = 0.1
+LEARNING_RATE = 0.05  # step along the mean gradient of a batch
+DISCOUNT_FACTOR = 0.9
+
+
+def features(current, mask):
+    # (N, FEATURES) float32 features of the side to move, `current` holds its discs
+    own = unpack_cells(current)[:, WINDOWS].sum(axis=2)
+    opp = unpack_cells(current ^ mask)[:, WINDOWS].sum(axis=2)
+    patterns = PATTERN_INDEX[own * 5 + opp]  # (N, 69)
+    result = np.zeros((len(current), FEATURES), dtype=np.float32)
+    rows, windows = np.nonzero(patterns >= 0)
+    result[rows, windows * PATTERNS + patterns[rows, windows]] = 1.0
+    result[:, -1] = 1.0
+    return result
+
+
+def game_features(game):
+    # features of a Connect4 game for its side to move
+    current = np.array([game.player_bits(game.current_player)], dtype=np.uint64)
+    return features(current, np.array([game.mask], dtype=np.uint64))
+
+
+class LinearQ:
+    def __init__(self, weights=None):
+        self.weights = weights if weights is not None else np.zeros((COLUMNS, FEATURES), dtype=np.float32)
+
+    def values(self, phi):
+        # (N, 7) Q-values of (N, FEATURES) features
+        return phi @ self.weights.T
+
+    def update(self, phi, actions, targets, learning_rate=LEARNING_RATE):
+        # one semi-gradient step along the mean gradient of the (features, action) rows
+        errors = targets - (phi * self.weights[actions]).sum(axis=1)
+        np.add.at(self.weights, actions, (learning_rate / len(phi)) * errors[:, None] * phi)
+        return errors
+
+    def save(self, filename=MODEL_FILE):
+        np.savez(filename, weights=self.weights)
+
+    @classmethod
+    def load(cls, filename=MODEL_FILE):
+        try:
+            with np.load(filename) as data:
+                return cls(data['weights'])
+        except FileNotFoundError:
+            print("File not found. Returning an untrained model.")
+            return cls()
+
+
+def train(model, games, opponent=basic_moves, epsilon=EPSILON, learning_rate=LEARNING_RATE,
+          discount_factor=DISCOUNT_FACTOR, n=BATCH_GAMES, seed=None):
+    # model plays player 1 in `games` games, returns {1: wins, 2: wins, 0: draws}
+    batch = Connect4Batch(n, seed)
+    pending_phi = np.zeros((n, FEATURES), dtype=np.float32)  # the learner's last move per board
+    pending_action = np.zeros(n, dtype=np.int64)
+    pending = np.zeros(n, dtype=bool)
+    results = {PLAYER1: 0, PLAYER2: 0, 0: 0}
+    started = n
+    batch.done[min(n, games):] = True  # fewer boards than games
+    while not batch.done.all():
+        players = batch.players()
+        current = batch.current()
+        actions = np.zeros(n, dtype=np.int64)
+        learner = np.flatnonzero(~batch.done & (players == PLAYER1))
+        if len(learner):
+            phi = features(current[learner], batch.mask[learner])
+            q_values = model.values(phi)
+            legal = column_bits(possible_moves(batch.mask[learner]))
+            # the move before this one (if any) leads here, no reward in between
+            waiting = pending[learner]
+            if waiting.any():
+                boards = learner[waiting]
+                targets = discount_factor * np.where(legal, q_values, -np.inf)[waiting].max(axis=1)
+                model.update(pending_phi[boards], pending_action[boards], targets, learning_rate)
+            actions[learner] = epsilon_greedy(q_values, legal, epsilon, batch.rng)
+            pending_phi[learner] = phi
+            pending_action[learner] = actions[learner]
+            pending[learner] = True
+        other = np.flatnonzero(~batch.done & (players == PLAYER2))
+        if len(other):
+            actions[other] = opponent(current[other], batch.mask[other], batch.rng)
+        was_open = ~batch.done
+        batch.step(actions)
+        finished = np.flatnonzero(batch.done & was_open)
+        if len(finished):
+            winner = batch.winner[finished]
+            rewards = np.where(winner == PLAYER1, 1.0, np.where(winner == PLAYER2, -1.0, 0.0))
+            model.update(pending_phi[finished], pending_action[finished], rewards.astype(np.float32), learning_rate)
+            pending[finished] = False
+            for player in (PLAYER1, PLAYER2, 0):
+                results[player] += int(np.count_nonzero(winner == player))
+            restart = finished[:max(0, games - started)]
+            batch.reset(restart)
+            started += len(restart)
+    return results
+
+
+def linear_policy(model):
+    # c4batch policy playing the greedy move of the model
+    def linear_moves(current, mask, rng):
+        legal = column_bits(possible_moves(mask))
+        return greedy(model.values(features(current, mask)), legal)
+
+    return linear_moves
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    model = LinearQ.load() if os.path.exists(MODEL_FILE) else LinearQ()
+    start_time = time.time()
+    results = train(model, games, seed=0)
+    elapsed = time.time() - start_time
+    print(f"training vs basic: {results[PLAYER1]} wins, {results[PLAYER2]} losses, {results[0]} draws, "
+          f"{games} games in {elapsed:.2f} seconds ({games / elapsed:,.0f} games/s)")
+    model.save()
+    print(f"Model stored in '{MODEL_FILE}'.")
+    for name, opponent in (('random', random_moves), ('basic', basic_moves)):
+        winner = Connect4Batch(10000, seed=1).play(linear_policy(model), opponent)
+        print(f"greedy vs {name}: {np.count_nonzero(winner == PLAYER1)} wins, "
+              f"{np.count_nonzero(winner == PLAYER2)} losses, {np.count_nonzero(winner == 0)} draws")
+
+
+if __name__ == "__main__":
+    main()
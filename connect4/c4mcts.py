@@ -0,0 +1,183 @@
+#Monte Carlo tree search (UCT) for connect4
+#
+#   python3 c4mcts.py [games] [move time]
+#
+# playouts run on two plain ints like the solver: `current` (discs of the side
+# to move) and `mask` (all discs), no Connect4 object and no numpy, so a
+# playout is a few dozen bit operations per move. rollout='basic' plays the
+# basic agent (win, otherwise block, otherwise random) instead of random moves.
+#
+# the tree is kept between moves: the next search starts from the node of
+# the position reached after the opponent's reply, if the tree has it.
+import math
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from c4board import COLUMNS, is_aligned, column_mask
+from c4solver import winning_cells, possible_moves
+from c4search import MOVE_TIME
+
+EXPLORATION = 1.4  # UCT constant, sqrt(2) in theory
+COLUMN_MASKS = [column_mask(col) for col in range(COLUMNS)]
+ROLLOUTS = ('random', 'basic')
+
+
+def random_rollout(current, mask):
+    # result of random play for the side to move: 1 win, 0 loss, 0.5 draw
+    side = 0
+    while True:
+        possible = possible_moves(mask)
+        if not possible:
+            return 0.5
+        move = random.choice([possible & m for m in COLUMN_MASKS if possible & m])
+        current |= move
+        mask |= move
+        if is_aligned(current):
+            return 1.0 if side == 0 else 0.0
+        current ^= mask
+        side ^= 1
+
+
+def basic_rollout(current, mask):
+    # the same with BasicAgent moves for both sides
+    side = 0
+    while True:
+        possible = possible_moves(mask)
+        if not possible:
+            return 0.5
+        if winning_cells(current, mask) & possible:
+            return 1.0 if side == 0 else 0.0
+        block = winning_cells(current ^ mask, mask) & possible
+        if block:
+            move = block & -block  # leftmost block, like BasicAgent
+        else:
+            move = random.choice([possible & m for m in COLUMN_MASKS if possible & m])
+        current |= move
+        mask |= move
+        current ^= mask
+        side ^= 1
+
+
+class Node:
+    __slots__ = ('parent', 'children', 'untried', 'visits', 'wins', 'current', 'mask', 'result')
+
+    def __init__(self, parent, current, mask, result=None):
+        self.parent = parent
+        self.children = {}  # column -> Node
+        self.current = current  # discs of the side to move
+        self.mask = mask
+        self.result = result  # 1 or 0.5 once the move into this node ended the game
+        possible = possible_moves(mask) if result is None else 0
+        self.untried = [col for col in range(COLUMNS) if possible & COLUMN_MASKS[col]]
+        self.visits = 0
+        self.wins = 0.0  # for the player who moved into this node
+
+    def play(self, col):
+        move = possible_moves(self.mask) & COLUMN_MASKS[col]
+        current = self.current | move
+        mask = self.mask | move
+        if is_aligned(current):
+            result = 1.0
+        elif possible_moves(mask) == 0:
+            result = 0.5
+        else:
+            result = None
+        child = Node(self, current ^ mask, mask, result)
+        self.children[col] = child
+        return child
+
+    def select(self, exploration):
+        log_visits = math.log(self.visits)
+        best_score, best_child = -1.0, None
+        for child in self.children.values():
+            score = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best_score, best_child = score, child
+        return best_child
+
+
+class MCTS:
+    def __init__(self, exploration=EXPLORATION, rollout='random'):
+        if rollout not in ROLLOUTS:
+            raise ValueError(f"unknown rollout {rollout!r}, use one of {ROLLOUTS}")
+        self.exploration = exploration
+        self.rollout = random_rollout if rollout == 'random' else basic_rollout
+        self.root = None
+        self.playouts = 0  # over all searches, with search_time for playouts/s
+        self.search_time = 0.0
+        self.reused = 0  # visits inherited from earlier searches
+
+    def reset(self):
+        self.root = None
+
+    def find_root(self, current, mask):
+        # the node of this position among the last root, its children and grandchildren
+        nodes = [self.root] if self.root is not None else []
+        for _ in range(3):
+            for node in nodes:
+                if node.mask == mask and node.current == current:
+                    node.parent = None
+                    return node
+            nodes = [child for node in nodes for child in node.children.values()]
+        return Node(None, current, mask)
+
+    def best_move(self, game, time_limit=MOVE_TIME, iterations=None):
+        # most visited column after `iterations` playouts or `time_limit` seconds
+        start_time = time.time()
+        root = self.find_root(game.player_bits(game.current_player), game.mask)
+        self.reused += root.visits
+        deadline = start_time + time_limit if iterations is None else None
+        count = 0
+        while (count < iterations) if iterations is not None else (time.time() < deadline or count == 0):
+            self.iterate(root)
+            count += 1
+        self.root = root
+        self.playouts += count
+        self.search_time += time.time() - start_time
+        return max(root.children, key=lambda col: root.children[col].visits)
+
+    def iterate(self, node):
+        # selection
+        while not node.untried and node.result is None:
+            node = node.select(self.exploration)
+        # expansion
+        if node.result is None:
+            node = node.play(node.untried.pop(random.randrange(len(node.untried))))
+        # simulation, result for the player who moved into node
+        if node.result is not None:
+            result = node.result
+        else:
+            result = 1.0 - self.rollout(node.current, node.mask)
+        # backpropagation
+        while node is not None:
+            node.visits += 1
+            node.wins += result
+            result = 1.0 - result
+            node = node.parent
+
+    def playouts_per_second(self):
+        return self.playouts / self.search_time if self.search_time else 0.0
+
+
+def main():
+    from gamecore.engine import play_games
+    from c4board import Connect4
+    from c4agents import MCTSAgent, AlphaBetaAgent, BasicAgent
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    move_time = float(sys.argv[2]) if len(sys.argv) > 2 else MOVE_TIME
+    for rollout in ROLLOUTS:
+        for name, opponent in (('basic', BasicAgent()), ('alphabeta', AlphaBetaAgent(move_time))):
+            mcts = MCTSAgent(move_time, rollout=rollout)
+            first = play_games(Connect4, mcts, opponent, games // 2)
+            second = play_games(Connect4, opponent, mcts, games - games // 2)
+            wins, losses = first[1] + second[2], first[2] + second[1]
+            print(f"mcts ({rollout} rollouts) vs {name}: {wins} wins, {losses} losses, "
+                  f"{games - wins - losses} draws at {move_time} s per move, "
+                  f"{mcts.search.playouts_per_second():,.0f} playouts/s, "
+                  f"{mcts.search.reused / max(1, mcts.move_count):,.0f} visits reused per move")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#move ordering for the connect4 alpha-beta search
+#
+# every heuristic can be switched off on its own, so node counts of the
+# search can be compared against plain left to right ordering at equal depth.
+COLUMNS = 7
+MAX_PLY = 42
+CENTER_ORDER = [3, 2, 4, 1, 5, 0, 6]
+
+
+class MoveOrdering:
+    def __init__(self, center=True, killers=True, history=True, hash_move=True):
+        self.center = center
+        self.killers = killers
+        self.history = history
+        self.hash_move = hash_move
+        self.killer_moves = [[None, None] for _ in range(MAX_PLY + 1)]
+        self.history_scores = {1: [0] * COLUMNS, 2: [0] * COLUMNS}
+
+    def new_search(self):
+        self.killer_moves = [[None, None] for _ in range(MAX_PLY + 1)]
+        # keep some history between moves but let new cutoffs dominate
+        for scores in self.history_scores.values():
+            for col in range(COLUMNS):
+                scores[col] //= 2
+
+    def order(self, board, ply, player, hash_move=None):
+        columns = CENTER_ORDER if self.center else range(COLUMNS)
+        moves = [col for col in columns if board.can_play(col)]
+        if self.history:
+            scores = self.history_scores[player]
+            moves.sort(key=lambda col: -scores[col])  # stable, ties keep the static order
+        first = []
+        if self.hash_move and hash_move in moves:
+            first.append(hash_move)
+        if self.killers:
+            for col in self.killer_moves[ply]:
+                if col is not None and col in moves and col not in first:
+                    first.append(col)
+        if not first:
+            return moves
+        return first + [col for col in moves if col not in first]
+
+    def record_cutoff(self, column, ply, player, depth):
+        if self.killers:
+            killers = self.killer_moves[ply]
+            if killers[0] != column:
+                killers[1] = killers[0]
+                killers[0] = column
+        if self.history:
+            self.history_scores[player][column] += depth * depth
+
+
+def make_ordering(name):
+    if name == 'left_to_right':
+        return MoveOrdering(center=False, killers=False, history=False, hash_move=False)
+    elif name == 'center':
+        return MoveOrdering(killers=False, history=False, hash_move=False)
+    elif name == 'full':
+        return MoveOrdering()
+    raise ValueError(f"Unknown move ordering: {name}")
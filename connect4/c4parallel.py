@@ -0,0 +1,170 @@
+#root parallel connect4 search over a process pool
+#
+#   python3 c4parallel.py [max depth] [workers]
+#
+# mode 'alphabeta' splits the root: every playable column is searched by a
+# worker to depth - 1 (or for its share of the time limit) and the best score
+# at the deepest depth every column completed decides. Each worker keeps its AlphaBetaSearch between columns and moves, so
+# its transposition table, killers and history carry over, but tables are
+# not shared between processes. Root columns are searched with a full window,
+# which costs the pruning between them that a serial search gets.
+#
+# mode 'mcts' runs one fresh MCTS tree per worker from the root for the whole
+# time budget (root parallelization) and adds up the visits of the root columns.
+#
+# with workers=1 the same tasks run in this process, on a search of the
+# ParallelSearch itself. Inside a daemonic pool worker (gamecore.tournament)
+# it always runs in-process.
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from c4board import Connect4
+from c4eval import evaluate_board, terminal_score
+from c4ordering import CENTER_ORDER
+from c4search import AlphaBetaSearch, MOVE_TIME, TT_MEMORY_MB, MAX_DEPTH
+from c4mcts import MCTS
+
+MODES = ('alphabeta', 'mcts')
+
+_worker = {}  # the search of a pool worker process
+
+
+def make_search(mode, options):
+    return AlphaBetaSearch(**options) if mode == 'alphabeta' else MCTS(**options)
+
+
+def init_worker(mode, options):
+    _worker['search'] = make_search(mode, options)
+
+
+def replay(moves):
+    game = Connect4()
+    for col in moves:
+        game.make_move(col)
+        game.switch_player()
+    return game
+
+
+def search_column(task, search=None):
+    # (column, scores) of one root column, scores[d - 1] is its score from player
+    # 1's point of view at root depth d, for every depth the worker completed.
+    # search is the in-process search, None in a pool worker
+    moves, column, depth, time_limit = task
+    search = search or _worker['search']
+    game = replay(moves + [column])
+    score = terminal_score(game)
+    if score is not None:
+        return column, [score] * (depth or MAX_DEPTH)
+    if depth == 1:
+        return column, [evaluate_board(game)]
+    search.iterative_deepening(game, time_limit, depth - 1 if depth else MAX_DEPTH)
+    scores = [evaluate_board(game)] + search.depth_scores
+    if len(scores) == game.rows * game.columns - len(game.moves) + 1:
+        scores += [scores[-1]] * (MAX_DEPTH - len(scores))  # searched to the full board, exact
+    return column, scores
+
+
+def search_tree(task, search=None):
+    # ({column: visits}, playouts) of a fresh MCTS tree from the root. The tree
+    # is not kept: a worker may run several tasks of one move, and reusing its
+    # tree would count the visits of the earlier ones again
+    moves, time_limit, iterations, seed = task
+    random.seed(seed)
+    search = search or _worker['search']
+    search.reset()
+    playouts = search.playouts
+    search.best_move(replay(moves), time_limit, iterations)
+    return {col: child.visits for col, child in search.root.children.items()}, search.playouts - playouts
+
+
+class ParallelSearch:
+    def __init__(self, workers=None, mode='alphabeta', **options):
+        if mode not in MODES:
+            raise ValueError(f"unknown mode {mode!r}, use one of {MODES}")
+        self.workers = workers or os.cpu_count() or 1
+        if multiprocessing.current_process().daemon:
+            self.workers = 1  # in a pool worker (e.g. gamecore.tournament), which cannot start a pool
+        self.mode = mode
+        if mode == 'alphabeta':
+            options.setdefault('tt_mb', TT_MEMORY_MB)
+        if self.workers == 1:
+            self.search = make_search(mode, options)
+            self.pool = None
+        else:
+            self.search = None
+            self.pool = multiprocessing.Pool(self.workers, init_worker, (mode, options))
+        self.depth = 0  # completed depth and score of the last alphabeta search
+        self.score = None
+        self.playouts = 0  # playouts of the last mcts search, all trees together
+        self.seed = 0
+
+    def map(self, function, tasks):
+        if self.pool is None:
+            return [function(task, self.search) for task in tasks]
+        return self.pool.map(function, tasks, chunksize=1)
+
+    def best_move(self, game, time_limit=MOVE_TIME, depth=None):
+        # depth (alphabeta) or iterations (mcts) instead of the time limit when given
+        if self.mode == 'mcts':
+            return self.mcts_move(game, time_limit, depth)
+        moves = list(game.moves)
+        columns = [col for col in CENTER_ORDER if game.can_play(col)]
+        # the columns are searched ceil(columns / workers) after each other
+        share = None if depth else time_limit / math.ceil(len(columns) / self.workers)
+        results = self.map(search_column, [(moves, col, depth, share) for col in columns])
+        # compare the columns at the deepest depth all of them completed, the
+        # window scores of odd and even depths are biased in opposite directions
+        self.depth = min(len(scores) for _, scores in results)
+        pick = max if game.current_player == game.player1 else min
+        column, scores = pick(results, key=lambda result: result[1][self.depth - 1])  # first of equal scores
+        self.score = scores[self.depth - 1]
+        return column
+
+    def mcts_move(self, game, time_limit, iterations):
+        moves = list(game.moves)
+        tasks = []
+        for _ in range(self.workers):
+            self.seed += 1
+            tasks.append((moves, time_limit, iterations, self.seed))
+        visits = {}
+        self.playouts = 0
+        for tree_visits, playouts in self.map(search_tree, tasks):
+            self.playouts += playouts
+            for col, count in tree_visits.items():
+                visits[col] = visits.get(col, 0) + count
+        return max(visits, key=visits.get)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+
+def main():
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    parallel = ParallelSearch(workers)
+    serial = AlphaBetaSearch()
+    game = replay([3, 3, 2, 4])  # a quiet opening
+    print(f"{parallel.workers} workers")
+    try:
+        for depth in range(3, max_depth + 1):
+            start_time = time.time()
+            serial_column, serial_score, _ = serial.iterative_deepening(game, None, depth)
+            serial_time = time.time() - start_time
+            start_time = time.time()
+            column = parallel.best_move(game, depth=depth)
+            parallel_time = time.time() - start_time
+            print(f"depth {depth}: serial column {serial_column} (score {serial_score}) in {serial_time:.3f} s, "
+                  f"parallel column {column} (score {parallel.score}) in {parallel_time:.3f} s")
+    finally:
+        parallel.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#bounded Q-value store for connect4 Q-learning
+#
+# entries are keyed by Connect4.canonical_key() and kept in flat typed arrays
+# like c4transposition, so the memory cap is exact. Slots are grouped in
+# buckets of WAYS slots: a new position takes a free slot of its bucket or
+# evicts the least recently used (or least visited) entry of that bucket.
+from array import array
+import numpy as np
+from c4board import Connect4, COLUMNS
+
+EMPTY = -1
+WAYS = 4
+# key (8) + 7 Q-values (28) + visits (4) + last use (4)
+ENTRY_BYTES = 8 + 4 * COLUMNS + 4 + 4
+POLICIES = ('lru', 'least_visited')
+
+
+class QStore:
+    def __init__(self, max_mb=64, eviction='lru'):
+        if eviction not in POLICIES:
+            raise ValueError(f"unknown eviction policy {eviction!r}, use one of {POLICIES}")
+        self.eviction = eviction
+        self.buckets = max(1, int(max_mb * 1024 * 1024) // (ENTRY_BYTES * WAYS))
+        self.size = self.buckets * WAYS
+        self.keys = array('q', [EMPTY]) * self.size
+        self.values = array('f', [0.0]) * (self.size * COLUMNS)
+        self.visits = array('I', [0]) * self.size
+        self.last_used = array('I', [0]) * self.size
+        self.clock = 0
+        self.entries = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def slot(self, key, insert=False):
+        # slot holding key, -1 if missing and not inserted
+        start = key % self.buckets * WAYS
+        free = -1
+        for i in range(start, start + WAYS):
+            stored = self.keys[i]
+            if stored == key:
+                return i
+            if stored == EMPTY and free < 0:
+                free = i
+        if not insert:
+            return -1
+        if free < 0:
+            free = self.victim(start)
+            self.evictions += 1
+        else:
+            self.entries += 1
+        self.keys[free] = key
+        self.visits[free] = 0
+        self.values[free * COLUMNS:(free + 1) * COLUMNS] = array('f', [0.0]) * COLUMNS
+        return free
+
+    def victim(self, start):
+        slots = range(start, start + WAYS)
+        if self.eviction == 'lru':
+            return min(slots, key=lambda i: self.last_used[i])
+        return min(slots, key=lambda i: (self.visits[i], self.last_used[i]))
+
+    def touch(self, i):
+        self.clock = (self.clock + 1) & 0xFFFFFFFF
+        self.last_used[i] = self.clock
+        self.visits[i] = min(self.visits[i] + 1, 0xFFFFFFFF)
+
+    def get(self, key):
+        # the Q-values of key as a numpy array (a copy), zeros for unknown positions
+        i = self.slot(key)
+        if i < 0:
+            self.misses += 1
+            return np.zeros(COLUMNS)
+        self.hits += 1
+        self.touch(i)
+        return np.array(self.values[i * COLUMNS:(i + 1) * COLUMNS], dtype=np.float64)
+
+    def max_value(self, key, actions=None):
+        # highest Q-value of `actions` (all columns when None), 0 for unknown positions
+        i = self.slot(key)
+        if i < 0:
+            return 0.0
+        if actions is None:
+            return max(self.values[i * COLUMNS:(i + 1) * COLUMNS])
+        return max(self.values[i * COLUMNS + action] for action in actions)
+
+    def batch_values(self, keys):
+        # (N, 7) Q-values of an array of keys
+        return np.array([self.get(key) for key in keys.tolist()]).reshape(len(keys), COLUMNS)
+
+    def store(self, key, q_values):
+        i = self.slot(key, insert=True)
+        self.touch(i)
+        self.values[i * COLUMNS:(i + 1) * COLUMNS] = array('f', [float(q) for q in q_values])
+        self.stores += 1
+
+    def update(self, key, action, target, learning_rate):
+        # Q(key, action) += learning_rate * (target - Q(key, action))
+        i = self.slot(key, insert=True)
+        self.touch(i)
+        j = i * COLUMNS + action
+        self.values[j] += learning_rate * (target - self.values[j])
+        self.stores += 1
+
+    def __contains__(self, key):
+        return self.slot(key) >= 0
+
+    def __len__(self):
+        return self.entries
+
+    def items(self):
+        for i, key in enumerate(self.keys):
+            if key != EMPTY:
+                yield key, list(self.values[i * COLUMNS:(i + 1) * COLUMNS])
+
+    def clear(self):
+        self.keys = array('q', [EMPTY]) * self.size
+        self.entries = 0
+
+    def occupancy(self):
+        return self.entries / self.size
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': self.size,
+            'entries': self.entries,
+            'memory_mb': self.size * ENTRY_BYTES / (1024 * 1024),
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'occupancy': self.occupancy(),
+        }
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def to_arrays(self):
+        # (sorted keys, values) for gamecore.qfile
+        keys = np.frombuffer(self.keys, dtype=np.int64)
+        slots = np.flatnonzero(keys != EMPTY)
+        slots = slots[np.argsort(keys[slots])]
+        values = np.frombuffer(self.values, dtype=np.float32).reshape(self.size, COLUMNS)
+        return keys[slots].copy(), values[slots]
+
+    @classmethod
+    def from_arrays(cls, keys, values, max_mb=64, eviction='lru'):
+        store = cls(max_mb, eviction)
+        for key, q_values in zip(keys.tolist(), values.tolist()):
+            store.store(key, q_values)
+        return store
+
+    @classmethod
+    def from_dict(cls, q_table, max_mb=64, eviction='lru'):
+        # q_table maps canonical keys to 7 Q-values. Keys from before the
+        # bitboards (str(board.flatten())) are converted to canonical keys.
+        store = cls(max_mb, eviction)
+        for key, q_values in q_table.items():
+            if isinstance(key, str):
+                key, mirrored = legacy_key(key)
+                if mirrored:
+                    q_values = q_values[::-1]
+            store.store(key, q_values)
+        return store
+
+
+class MappedQStore:
+    # read-only QStore over the sorted keys and values of a gamecore.qfile
+    # file, looked up by binary search. Used for play without learning, the
+    # arrays are usually memmaps shared by every process reading the file.
+    def __init__(self, keys, values):
+        self.keys = np.asarray(keys)  # plain ndarray views, memmap indexing is slower
+        self.values = np.asarray(values)
+        self.hits = 0
+        self.misses = 0
+
+    def slot(self, key):
+        i = int(np.searchsorted(self.keys, key))
+        if i < len(self.keys) and self.keys[i] == key:
+            return i
+        return -1
+
+    def get(self, key):
+        i = self.slot(key)
+        if i < 0:
+            self.misses += 1
+            return np.zeros(COLUMNS)
+        self.hits += 1
+        return self.values[i].astype(np.float64)
+
+    def max_value(self, key, actions=None):
+        i = self.slot(key)
+        if i < 0:
+            return 0.0
+        return float(self.values[i].max() if actions is None else self.values[i][actions].max())
+
+    def batch_values(self, keys):
+        # (N, 7) Q-values of an array of keys, one binary search for all of them
+        values = np.zeros((len(keys), COLUMNS))
+        if len(self.keys):
+            index = np.searchsorted(self.keys, keys).clip(max=len(self.keys) - 1)
+            found = self.keys[index] == keys
+            values[found] = self.values[index[found]]
+            self.hits += int(found.sum())
+            self.misses += len(keys) - int(found.sum())
+        else:
+            self.misses += len(keys)
+        return values
+
+    def __contains__(self, key):
+        return self.slot(key) >= 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def items(self):
+        for key, q_values in zip(self.keys.tolist(), self.values.tolist()):
+            yield key, q_values
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.keys),
+            'entries': len(self.keys),
+            'memory_mb': (self.keys.nbytes + self.values.nbytes) / (1024 * 1024),
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': 0,
+            'evictions': 0,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'occupancy': 1.0,
+        }
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def to_arrays(self):
+        return self.keys, self.values
+
+
+def legacy_key(text):
+    # canonical key of a board saved as str(board.flatten()), row 0 is the top row
+    cells = [int(float(cell)) for cell in text.strip('[]').split()]
+    board = Connect4()
+    for col in range(COLUMNS):
+        for row in range(board.rows - 1, -1, -1):
+            player = cells[row * COLUMNS + col]
+            if player:
+                board.drop(col, player)
+    return board.canonical_key()
@@ -0,0 +1,245 @@
+#connect4 searches used by the GUIs, the agents and the headless runner
+#
+# scores are from player 1's point of view: player 1 maximizes, player 2
+# minimizes. Searches run on a copy of the game and use drop/undo on it.
+import time
+import numpy as np
+from c4eval import evaluate_board, terminal_score
+from c4transposition import TranspositionTable, EXACT, LOWER, UPPER
+from c4ordering import make_ordering
+from c4solver import Solver, SOLVER_TT_MB
+
+TT_MEMORY_MB = 16  # memory cap of the transposition table
+MOVE_TIME = 0.05  # seconds per move for the iterative deepening search
+MAX_DEPTH = 42
+NET_SCALE = 1000  # evaluator values (-1 to 1) in window score units, far below a win
+
+
+def frontier(board, player, evaluator):
+    # (column, score) of a node one move above the leaves: the open children
+    # are scored with one evaluator.evaluate(current, mask) call (c4valuenet)
+    opponent = board.player2 if player == board.player1 else board.player1
+    scores = []
+    open_children = []
+    for col in board.valid_moves():
+        board.drop(col, player)
+        score = terminal_score(board)
+        if score is None:
+            open_children.append((len(scores), board.player_bits(opponent), board.mask))
+        scores.append([col, score])
+        board.undo()
+    if open_children:
+        indices, current, mask = zip(*open_children)
+        values = evaluator.evaluate(np.array(current, dtype=np.uint64), np.array(mask, dtype=np.uint64))
+        # values are for the opponent, to move in the children
+        sign = -NET_SCALE if player == board.player1 else NET_SCALE
+        for i, value in zip(indices, values.tolist()):
+            scores[i][1] = sign * value
+    if player == board.player1:
+        return tuple(max(scores, key=lambda entry: entry[1]))
+    return tuple(min(scores, key=lambda entry: entry[1]))
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class MinimaxSearch:
+    def __init__(self, depth=3, evaluator=None):
+        self.depth = depth
+        self.evaluator = evaluator  # batched leaf evaluation instead of evaluate_board
+        self.nodes = 0
+
+    def best_move(self, game):
+        maximizing = game.current_player == game.player1
+        return self.minimax(game.copy(), self.depth, maximizing)[0]
+
+    def minimax(self, board, depth, maximizing_player):
+        self.nodes += 1
+        score = terminal_score(board)
+        if score is not None:
+            return None, score
+        if depth == 0:
+            return None, evaluate_board(board)
+        if depth == 1 and self.evaluator is not None:
+            self.nodes += len(board.valid_moves())
+            return frontier(board, board.player1 if maximizing_player else board.player2, self.evaluator)
+
+        if maximizing_player:
+            max_eval = float('-inf')
+            best_column = None
+            for col in range(board.columns):
+                if board.can_play(col):
+                    board.drop(col, board.player1)
+                    _, eval_score = self.minimax(board, depth - 1, False)
+                    board.undo()
+                    if eval_score > max_eval:
+                        max_eval = eval_score
+                        best_column = col
+            return best_column, max_eval
+        else:
+            min_eval = float('inf')
+            best_column = None
+            for col in range(board.columns):
+                if board.can_play(col):
+                    board.drop(col, board.player2)
+                    _, eval_score = self.minimax(board, depth - 1, True)
+                    board.undo()
+                    if eval_score < min_eval:
+                        min_eval = eval_score
+                        best_column = col
+            return best_column, min_eval
+
+
+class AlphaBetaSearch:
+    def __init__(self, tt_mb=TT_MEMORY_MB, ordering='full', solver_discs=None, book=None, evaluator=None,
+                 solver_tt_mb=SOLVER_TT_MB):
+        self.evaluator = evaluator  # batched leaf evaluation instead of evaluate_board
+        self.transposition_table = TranspositionTable(tt_mb)
+        self.move_ordering = make_ordering(ordering)
+        # the solver and its table only exist when there is a book or endgame solving
+        self.solver = Solver(solver_tt_mb, book) if book or solver_discs is not None else None
+        self.solver_discs = solver_discs  # play perfectly once this many discs are on the board
+        self.deadline = None
+        self.principal_variation = []
+        self.pv_moves = {}
+        self.depth_scores = []  # root score of every completed depth of the last search
+        self.root_ply = 0
+        self.nodes = 0
+
+    def best_move(self, game, time_limit=MOVE_TIME, depth=None):
+        # (column, completed depth): book or solver move first, then the heuristic search
+        column, completed_depth = self.solver_move(game)
+        if column is None and depth:
+            column, _, completed_depth = self.iterative_deepening(game, None, depth)
+        elif column is None:
+            column, _, completed_depth = self.iterative_deepening(game, time_limit)
+        return column, completed_depth
+
+    def solver_move(self, game):
+        # opening book lookups, then exact solving for the endgame
+        if self.solver is None:
+            return None, 0
+        entry = self.solver.book_lookup(game)
+        if entry is None and self.solver_discs is not None and len(game.moves) >= self.solver_discs:
+            entry = self.solver.solve(game)
+        if entry is None:
+            return None, 0
+        return entry[1], game.rows * game.columns - len(game.moves)
+
+    def iterative_deepening(self, game, time_limit, max_depth=MAX_DEPTH):
+        # search depth 1, 2, 3... until the deadline and keep the last completed result
+        self.deadline = time.time() + time_limit if time_limit else None
+        self.transposition_table.new_search()
+        self.move_ordering.new_search()
+        self.root_ply = len(game.moves)
+        self.principal_variation = []
+        self.pv_moves = {}
+        self.depth_scores = []
+        maximizing = game.current_player == game.player1
+        best_column, best_score, completed_depth = None, None, 0
+        max_depth = min(max_depth, game.rows * game.columns - len(game.moves))
+        for depth in range(1, max_depth + 1):
+            try:
+                column, score = self.minimax(game.copy(), depth, float('-inf'), float('inf'), maximizing)
+            except SearchTimeout:
+                break
+            best_column, best_score, completed_depth = column, score, depth
+            self.depth_scores.append(score)
+            self.update_principal_variation(game, depth)
+        self.deadline = None
+        if best_column is None:
+            best_column = game.valid_moves()[0]
+        return best_column, best_score, completed_depth
+
+    def update_principal_variation(self, game, depth):
+        # follow the stored best columns from the root, the next iteration searches them first
+        board = game.copy()
+        player = game.current_player
+        self.principal_variation = []
+        self.pv_moves = {}
+        for _ in range(depth):
+            column = self.transposition_table.best_move(board.key())
+            if column is None or not board.can_play(column):
+                break
+            self.pv_moves[board.key()] = column
+            self.principal_variation.append(column)
+            board.drop(column, player)
+            player = game.player2 if player == game.player1 else game.player1
+
+    def minimax(self, board, depth, alpha, beta, maximizing_player):
+        if self.deadline is not None and time.time() > self.deadline:
+            raise SearchTimeout()
+        self.nodes += 1
+        score = terminal_score(board)
+        if score is not None:
+            return None, score
+        alpha_orig, beta_orig = alpha, beta
+        key = board.key()
+        hash_move = None
+        entry = self.transposition_table.probe(key)
+        if entry is not None:
+            tt_depth, tt_score, tt_flag, hash_move = entry
+            if tt_depth >= depth:
+                if tt_flag == EXACT:
+                    return hash_move, tt_score
+                elif tt_flag == LOWER:
+                    alpha = max(alpha, tt_score)
+                else:
+                    beta = min(beta, tt_score)
+                if beta <= alpha:
+                    return hash_move, tt_score
+
+        if depth == 0:
+            return None, evaluate_board(board)
+        if depth == 1 and self.evaluator is not None:
+            # all children are scored, so the result is exact whatever the window
+            self.nodes += len(board.valid_moves())
+            best_column, best_eval = frontier(board, board.player1 if maximizing_player else board.player2,
+                                              self.evaluator)
+            self.transposition_table.store(key, depth, best_eval, EXACT, best_column)
+            return best_column, best_eval
+
+        # try the previous principal variation, then the stored best column first
+        hash_move = self.pv_moves.get(key, hash_move)
+        ply = len(board.moves) - self.root_ply
+        player = board.player1 if maximizing_player else board.player2
+        columns = self.move_ordering.order(board, ply, player, hash_move)
+
+        if maximizing_player:
+            best_eval = float('-inf')
+            best_column = None
+            for col in columns:
+                board.drop(col, player)
+                _, eval_score = self.minimax(board, depth - 1, alpha, beta, False)
+                board.undo()
+                if eval_score > best_eval:
+                    best_eval = eval_score
+                    best_column = col
+                alpha = max(alpha, eval_score)
+                if beta <= alpha:
+                    self.move_ordering.record_cutoff(col, ply, player, depth)
+                    break  # Beta cutoff
+        else:
+            best_eval = float('inf')
+            best_column = None
+            for col in columns:
+                board.drop(col, player)
+                _, eval_score = self.minimax(board, depth - 1, alpha, beta, True)
+                board.undo()
+                if eval_score < best_eval:
+                    best_eval = eval_score
+                    best_column = col
+                beta = min(beta, eval_score)
+                if beta <= alpha:
+                    self.move_ordering.record_cutoff(col, ply, player, depth)
+                    break  # Alpha cutoff
+
+        if best_eval <= alpha_orig:
+            flag = UPPER
+        elif best_eval >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.transposition_table.store(key, depth, best_eval, flag, best_column)
+        return best_column, best_eval
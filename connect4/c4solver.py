@@ -0,0 +1,270 @@
+#perfect play connect4 solver (negamax + null window search + transposition table)
+#
+# scores follow the usual convention: 0 is a draw, a positive score means the
+# side to move wins, and the earlier the win the higher the score
+# (22 - number of its own discs when it wins); negative scores are losses.
+#
+# usage:
+#   python3 c4solver.py solve 255245616446    # columns played so far, 1 = leftmost
+#   python3 c4solver.py book 2 255245616446   # solve every position up to 2 plies
+#                                             # after these moves into BOOK_FILE
+#
+# solving takes about a second per position at 14 discs, several seconds at
+# 12 and minutes with 10 discs or fewer, so a book only covers the subtree
+# below a given position: the example above solves 49 positions in about 90
+# seconds. Books from the empty board (about 92k positions at 8 plies) cannot
+# be built this way.
+import os
+import pickle
+import sys
+import time
+from c4board import Connect4, ROWS, COLUMNS, STRIDE, BOTTOM_MASK, BOARD_MASK, mirror, column_mask
+from c4transposition import TranspositionTable, LOWER, UPPER
+from c4ordering import CENTER_ORDER
+
+CELLS = ROWS * COLUMNS
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.pickle')
+SOLVER_TT_MB = 64  # memory cap of the solver's transposition table
+
+
+def winning_cells(position, mask):
+    # empty cells that would complete four in a row for `position`
+    # vertical
+    r = (position << 1) & (position << 2) & (position << 3)
+    for shift in (STRIDE, STRIDE - 1, STRIDE + 1):
+        p = (position << shift) & (position << 2 * shift)
+        r |= p & (position << 3 * shift)
+        r |= p & (position >> shift)
+        p = (position >> shift) & (position >> 2 * shift)
+        r |= p & (position << shift)
+        r |= p & (position >> 3 * shift)
+    return r & (BOARD_MASK ^ mask)
+
+
+def possible_moves(mask):
+    return (mask + BOTTOM_MASK) & BOARD_MASK
+
+
+def can_win_next(current, mask):
+    return winning_cells(current, mask) & possible_moves(mask) != 0
+
+
+def non_losing_moves(current, mask):
+    # playable cells that do not hand the opponent a win on the next move
+    possible = possible_moves(mask)
+    opponent_win = winning_cells(current ^ mask, mask)
+    forced = possible & opponent_win
+    if forced:
+        if forced & (forced - 1):
+            return 0  # two threats, cannot block both
+        possible = forced
+    return possible & ~(opponent_win >> 1)
+
+
+def move_score(current, mask, move):
+    # number of threats the move creates, used to sort moves
+    return bin(winning_cells(current | move, mask)).count('1')
+
+
+def side_to_move(board):
+    # the bits of the player to move, player 1 always starts
+    player = board.player1 if len(board.moves) % 2 == 0 else board.player2
+    return board.player_bits(player)
+
+
+def book_key(current, mask):
+    # the book stores one of each mirrored pair of positions
+    key = current + mask
+    mirrored_key = mirror(current) + mirror(mask)
+    return min(key, mirrored_key), mirrored_key < key
+
+
+class Solver:
+    def __init__(self, tt_mb=SOLVER_TT_MB, book=None):
+        self.transposition_table = TranspositionTable(tt_mb)
+        self.book = book if book else {}
+        self.nodes = 0
+
+    def negamax(self, current, mask, moves, alpha, beta):
+        # side to move cannot win immediately here, the caller checks that
+        self.nodes += 1
+        candidates = non_losing_moves(current, mask)
+        if candidates == 0:
+            return -((CELLS - moves) // 2)
+        if moves >= CELLS - 2:
+            return 0
+
+        lowest = -((CELLS - 2 - moves) // 2)
+        if alpha < lowest:
+            alpha = lowest
+            if alpha >= beta:
+                return alpha
+        highest = (CELLS - 1 - moves) // 2
+
+        key = current + mask
+        entry = self.transposition_table.probe(key)
+        if entry is not None:
+            _, value, flag, _ = entry
+            value = int(value)
+            if flag == LOWER:
+                if alpha < value:
+                    alpha = value
+                    if alpha >= beta:
+                        return alpha
+            elif value < highest:
+                highest = value
+        if beta > highest:
+            beta = highest
+            if alpha >= beta:
+                return beta
+
+        ordered = []
+        for col in CENTER_ORDER:
+            move = candidates & column_mask(col)
+            if move:
+                ordered.append((move_score(current, mask, move), move))
+        ordered.sort(key=lambda item: -item[0])  # stable, ties stay center first
+
+        for _, move in ordered:
+            score = -self.negamax(current ^ mask, mask | move, moves + 1, -beta, -alpha)
+            if score >= beta:
+                self.transposition_table.store(key, 0, score, LOWER, None)
+                return score
+            if score > alpha:
+                alpha = score
+        self.transposition_table.store(key, 0, alpha, UPPER, None)
+        return alpha
+
+    def solve_score(self, current, mask, moves):
+        if can_win_next(current, mask):
+            return (CELLS + 1 - moves) // 2
+        lowest = -((CELLS - moves) // 2)
+        highest = (CELLS + 1 - moves) // 2
+        # narrow the window with null window probes, closer to 0 first
+        while lowest < highest:
+            med = lowest + (highest - lowest) // 2
+            if med <= 0 and -(-lowest // 2) < med:
+                med = -(-lowest // 2)
+            elif med >= 0 and highest // 2 > med:
+                med = highest // 2
+            result = self.negamax(current, mask, moves, med, med + 1)
+            if result <= med:
+                highest = result
+            else:
+                lowest = result
+        return lowest
+
+    def move_value(self, current, mask, moves, col):
+        # exact score of playing `col`, from the point of view of the mover
+        move = (mask + (1 << (col * STRIDE))) & column_mask(col)
+        if winning_cells(current, mask) & move:
+            return (CELLS + 1 - moves) // 2
+        return -self.solve_score(current ^ mask, mask | move, moves + 1)
+
+    def book_lookup(self, board):
+        # (score, column) from the opening book, None if the position is not in it
+        key, mirrored = book_key(side_to_move(board), board.mask)
+        if key not in self.book:
+            return None
+        score, col = self.book[key]
+        return score, (COLUMNS - 1 - col if mirrored else col)
+
+    def solve(self, board):
+        # exact (score, best column) for the player to move on `board`
+        entry = self.book_lookup(board)
+        if entry is not None:
+            return entry
+
+        current = side_to_move(board)
+        mask = board.mask
+        moves = len(board.moves)
+        score = self.solve_score(current, mask, moves)
+        for col in CENTER_ORDER:
+            if board.can_play(col) and self.move_value(current, mask, moves, col) == score:
+                return score, col
+        return score, None
+
+
+def load_book(filename=BOOK_FILE):
+    try:
+        with open(filename, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return {}  # no book, everything is solved from scratch
+
+
+def children(board):
+    # (column, child) for every move that does not end the game, None as child for winning moves
+    player = board.player1 if len(board.moves) % 2 == 0 else board.player2
+    for col in board.valid_moves():
+        if board.is_winning_move(col, player):
+            yield col, None
+        else:
+            child = board.copy()
+            child.drop(col, player)
+            yield col, child
+
+
+def replay(moves):
+    # Connect4 board after `moves`, a string of columns with 1 = leftmost
+    board = Connect4()
+    for move in moves:
+        board.make_move(int(move) - 1)
+        board.switch_player()
+    return board
+
+
+def generate_book(plies, start='', filename=BOOK_FILE):
+    # only the positions `plies` moves after `start` are solved, earlier plies
+    # are backed up from their children; mirrored positions are stored once
+    levels = [[replay(start)]]
+    for ply in range(plies):
+        next_level = {}
+        for board in levels[-1]:
+            for _, child in children(board):
+                if child is not None:
+                    next_level.setdefault(book_key(side_to_move(child), child.mask)[0], child)
+        levels.append(list(next_level.values()))
+
+    solver = Solver()
+    book = {}
+    for ply in range(plies, -1, -1):
+        start_time = time.time()
+        for board in levels[ply]:
+            key, mirrored = book_key(side_to_move(board), board.mask)
+            if ply == plies:
+                score, col = solver.solve(board)
+            else:
+                score, col = None, None
+                for child_col, child in children(board):
+                    if child is None:
+                        value = (CELLS + 1 - len(board.moves)) // 2
+                    else:
+                        child_key, _ = book_key(side_to_move(child), child.mask)
+                        value = -book[child_key][0]
+                    if score is None or value > score:
+                        score, col = value, child_col
+            book[key] = (score, COLUMNS - 1 - col if mirrored else col)
+        print(f"{len(start) + ply} discs: {len(levels[ply])} positions, {time.time() - start_time:.1f} seconds")
+    with open(filename, 'wb') as f:
+        pickle.dump(book, f)
+    print(f"Opening book stored in '{filename}'.")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "book":
+        generate_book(int(sys.argv[2]), sys.argv[3] if len(sys.argv) > 3 else '',
+                      sys.argv[4] if len(sys.argv) > 4 else BOOK_FILE)
+    elif len(sys.argv) > 1 and sys.argv[1] == "solve":
+        board = replay(sys.argv[2] if len(sys.argv) > 2 else '')
+        solver = Solver(book=load_book())
+        start_time = time.time()
+        score, col = solver.solve(board)
+        print(f"score {score}, best column {col + 1 if col is not None else None}, "
+              f"{solver.nodes} nodes, {time.time() - start_time:.3f} seconds")
+    else:
+        print("usage: python3 c4solver.py solve <moves> | book <plies> [moves] [file]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#bounded transposition table for the connect4 searches
+#
+# entries are keyed by Connect4.key() (position + mask, unique per position)
+# and stored in flat typed arrays, so the memory cap is exact: one slot costs
+# ENTRY_BYTES bytes whatever is stored in it.
+from array import array
+
+EXACT = 0
+LOWER = 1  # stored score is a lower bound (fail high)
+UPPER = 2  # stored score is an upper bound (fail low)
+
+EMPTY = -1
+# key (8) + score (8) + depth (1) + flag (1) + best column (1) + generation (2)
+ENTRY_BYTES = 21
+
+
+class TranspositionTable:
+    def __init__(self, max_mb=16):
+        self.size = max(1, int(max_mb * 1024 * 1024) // ENTRY_BYTES)
+        self.keys = array('q', [EMPTY]) * self.size
+        self.scores = array('d', [0.0]) * self.size
+        self.depths = array('b', [0]) * self.size
+        self.flags = array('b', [0]) * self.size
+        self.moves = array('b', [-1]) * self.size
+        self.generations = array('H', [0]) * self.size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def new_search(self):
+        # entries from earlier searches are replaced first
+        self.generation = (self.generation + 1) & 0xFFFF
+
+    def probe(self, key):
+        i = key % self.size
+        stored = self.keys[i]
+        if stored == key:
+            self.hits += 1
+            move = self.moves[i]
+            return self.depths[i], self.scores[i], self.flags[i], (None if move < 0 else move)
+        self.misses += 1
+        if stored != EMPTY:
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, score, flag, move):
+        i = key % self.size
+        stored = self.keys[i]
+        if stored != EMPTY and stored != key:
+            # depth-preferred replacement, stale entries always give way
+            if self.generations[i] == self.generation and self.depths[i] > depth:
+                return
+            self.replacements += 1
+        self.keys[i] = key
+        self.scores[i] = score
+        self.depths[i] = depth
+        self.flags[i] = flag
+        self.moves[i] = -1 if move is None else move
+        self.generations[i] = self.generation
+        self.stores += 1
+
+    def best_move(self, key):
+        i = key % self.size
+        if self.keys[i] == key and self.moves[i] >= 0:
+            return self.moves[i]
+        return None
+
+    def clear(self):
+        self.keys = array('q', [EMPTY]) * self.size
+
+    def occupancy(self):
+        return 1 - self.keys.count(EMPTY) / self.size
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            'size': self.size,
+            'memory_mb': self.size * ENTRY_BYTES / (1024 * 1024),
+            'hits': self.hits,
+            'misses': self.misses,
+            'collisions': self.collisions,
+            'stores': self.stores,
+            'replacements': self.replacements,
+            'hit_rate': self.hits / probes if probes else 0.0,
+            'occupancy': self.occupancy(),
+        }
@@ -0,0 +1,170 @@
+#small numpy value network for connect4 leaves
+#
+#   python3 c4valuenet.py [games] [epochs]
+#
+# an MLP (498 -> 64 -> 32 -> 1, relu, tanh output) scores a position for the
+# side to move between -1 (lost) and 1 (won). Its input is the own and
+# opponent disc planes (2 x 42 cells) and the c4linear window patterns.
+# evaluate() takes arrays of bitboards, so a search scores all children of a
+# node with one call (see c4search.frontier). Training data comes from
+# self-play of c4batch.window_moves (the depth 1 minimax agent with the basic
+# agent's win/block rule) with some random moves, every position is labelled
+# with the result of its game.
+# Weights are stored in valuenet.npz.
+import os
+import sys
+import time
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from c4board import ROWS, COLUMNS, STRIDE
+from c4batch import Connect4Batch, unpack_cells, random_moves, window_moves
+from c4linear import FEATURES, features
+
+MODEL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'valuenet.npz')
+CELL_BITS = np.array([col * STRIDE + row for col in range(COLUMNS) for row in range(ROWS)], dtype=np.intp)
+INPUTS = 2 * len(CELL_BITS) + FEATURES - 1  # the bias feature is left out
+HIDDEN = (64, 32)
+SELF_PLAY_GAMES = 30000
+EPOCHS = 5
+BATCH_SIZE = 256
+LEARNING_RATE = 0.001
+RANDOM_MOVES = 0.1  # share of random moves in the self-play games
+
+
+def inputs(current, mask):
+    # (N, INPUTS) float32 network input for the side to move, `current` holds its discs
+    own = unpack_cells(current)[:, CELL_BITS]
+    opp = unpack_cells(current ^ mask)[:, CELL_BITS]
+    return np.concatenate([own, opp, features(current, mask)[:, :-1]], axis=1).astype(np.float32)
+
+
+class ValueNet:
+    def __init__(self, weights=None, seed=0):
+        if weights is None:
+            rng = np.random.default_rng(seed)
+            sizes = (INPUTS,) + HIDDEN + (1,)
+            weights = []
+            for fan_in, fan_out in zip(sizes[:-1], sizes[1:]):
+                weights.append(rng.normal(0.0, np.sqrt(2.0 / fan_in), (fan_in, fan_out)).astype(np.float32))
+                weights.append(np.zeros(fan_out, dtype=np.float32))
+        self.weights = weights  # [W1, b1, W2, b2, W3, b3]
+
+    def forward(self, x):
+        # output and the activations needed by backward
+        activations = [x]
+        for i in range(0, len(self.weights) - 2, 2):
+            x = np.maximum(x @ self.weights[i] + self.weights[i + 1], 0.0)
+            activations.append(x)
+        return np.tanh(x @ self.weights[-2] + self.weights[-1])[:, 0], activations
+
+    def evaluate(self, current, mask):
+        # (N,) values for the side to move of (N,) bitboard arrays
+        return self.forward(inputs(current, mask))[0]
+
+    def backward(self, output, activations, targets):
+        # gradients of the mean squared error, in the order of self.weights
+        delta = (2.0 / len(targets)) * (output - targets)[:, None] * (1.0 - output[:, None] ** 2)
+        gradients = []
+        for i in range(len(self.weights) - 2, -1, -2):
+            gradients.append(delta.sum(axis=0))
+            gradients.append(activations[i // 2].T @ delta)
+            if i:
+                delta = (delta @ self.weights[i].T) * (activations[i // 2] > 0)
+        return gradients[::-1]
+
+    def save(self, filename=MODEL_FILE):
+        np.savez(filename, *self.weights)
+
+    @classmethod
+    def load(cls, filename=MODEL_FILE):
+        try:
+            with np.load(filename) as data:
+                return cls([data[f'arr_{i}'] for i in range(len(data.files))])
+        except FileNotFoundError:
+            print("File not found. Returning an untrained network.")
+            return cls()
+
+
+def noisy(policy, share):
+    # c4batch policy playing a random move instead of the policy's one on `share` of the boards
+    def noisy_moves(current, mask, rng):
+        moves = policy(current, mask, rng)
+        explore = rng.random(len(moves)) < share
+        if explore.any():
+            moves[explore] = random_moves(current[explore], mask[explore], rng)
+        return moves
+
+    return noisy_moves
+
+
+def self_play_data(games, policy1, policy2, seed=None):
+    # (current, mask, value) of every position of `games` games, value is the
+    # result for the side to move: 1 won, -1 lost, 0 drawn
+    batch = Connect4Batch(games, seed)
+    positions = []
+    while not batch.done.all():
+        active = np.flatnonzero(~batch.done)
+        positions.append((active, batch.current()[active], batch.mask[active], batch.players()[active]))
+        batch.step(batch.policy_actions(policy1, policy2))
+    boards, current, mask, players = (np.concatenate(column) for column in zip(*positions))
+    winner = batch.winner[boards]
+    value = np.where(winner == 0, 0.0, np.where(winner == players, 1.0, -1.0)).astype(np.float32)
+    return current, mask, value
+
+
+def train(net, x, targets, epochs=EPOCHS, batch_size=BATCH_SIZE, learning_rate=LEARNING_RATE, seed=0):
+    # Adam on the mean squared error, returns the loss of every epoch
+    rng = np.random.default_rng(seed)
+    first = [np.zeros_like(w) for w in net.weights]
+    second = [np.zeros_like(w) for w in net.weights]
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    step = 0
+    losses = []
+    for _ in range(epochs):
+        order = rng.permutation(len(x))
+        total = 0.0
+        for start in range(0, len(x), batch_size):
+            rows = order[start:start + batch_size]
+            output, activations = net.forward(x[rows])
+            total += float(((output - targets[rows]) ** 2).sum())
+            step += 1
+            for w, g, m, v in zip(net.weights, net.backward(output, activations, targets[rows]), first, second):
+                m *= beta1
+                m += (1 - beta1) * g
+                v *= beta2
+                v += (1 - beta2) * g * g
+                w -= learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + eps)
+        losses.append(total / len(x))
+    return losses
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else SELF_PLAY_GAMES
+    epochs = int(sys.argv[2]) if len(sys.argv) > 2 else EPOCHS
+    start_time = time.time()
+    policy = noisy(window_moves, RANDOM_MOVES)
+    current, mask, value = self_play_data(games, policy, policy, seed=0)
+    x = inputs(current, mask)
+    print(f"{len(x)} positions from {games} self-play games in {time.time() - start_time:.2f} seconds")
+    order = np.random.default_rng(0).permutation(len(x))
+    train_rows, test_rows = order[:len(x) * 9 // 10], order[len(x) * 9 // 10:]
+    net = ValueNet()
+    start_time = time.time()
+    losses = train(net, x[train_rows], value[train_rows], epochs)
+    output, _ = net.forward(x[test_rows])
+    print(f"training loss {losses[-1]:.4f}, validation loss {float(((output - value[test_rows]) ** 2).mean()):.4f}, "
+          f"constant baseline {float(value[test_rows].var()):.4f}, {epochs} epochs in {time.time() - start_time:.2f} seconds")
+    net.save()
+    print(f"Network stored in '{MODEL_FILE}'.")
+    for size in (COLUMNS, 1024):
+        rows = np.arange(size) % len(current)
+        calls = max(1, 20000 // size)
+        start_time = time.time()
+        for _ in range(calls):
+            net.evaluate(current[rows], mask[rows])
+        elapsed = time.time() - start_time
+        print(f"evaluate, batches of {size}: {calls * size / elapsed:,.0f} positions/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+#headless core shared by the tic tac toe and connect4 folders
+#
+# the game modules live next to their scripts (tictacttoe/ttt_core.py,
+# connect4/c4board.py ...), this package only puts both folders on the path so
+# they can be imported without tkinter, from anywhere in the repo.
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+for folder in ('tictacttoe', 'connect4'):
+    path = os.path.normpath(os.path.join(ROOT, folder))
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,52 @@
+#game loop shared by the runner, the scripts and the trainers
+#
+# games follow the connect4 board interface: current_player, player1/player2,
+# make_move(move) -> bool, check_winner(player), is_board_full() and
+# switch_player(). Agents provide select_move(game) and game_over(game, winner).
+#
+# the loops are flat: a game is a while loop and a series of games a for loop,
+# so the stack depth stays the same however many moves and games are played.
+# GUIs hook in through on_move(game) instead of driving the game themselves.
+import time
+import gamecore  # noqa: F401 (puts the game folders on the path)
+
+
+def play_game(game, agents, on_move=None):
+    # agents maps each player to its agent, returns the winner or None for a draw
+    while True:
+        player = game.current_player
+        agent = agents[player]
+        start_time = time.time()
+        move = agent.select_move(game)
+        agent.total_time += time.time() - start_time
+        agent.move_count += 1
+        if not game.make_move(move):
+            raise ValueError(f"illegal move {move!r} by player {player}")
+        if on_move is not None:
+            on_move(game)
+        if game.check_winner(player):
+            winner = player
+            break
+        if game.is_board_full():
+            winner = None
+            break
+        game.switch_player()
+    game.game_over = True
+    for agent in dict.fromkeys(agents.values()):  # once per agent in self-play
+        agent.game_over(game, winner)
+    return winner
+
+
+def play_games(make_game, agent1, agent2, games, on_move=None, on_game_over=None):
+    # {player: wins, None: draws}, agent1 always moves first.
+    # on_game_over(game, winner) is called after every game.
+    results = None
+    for _ in range(games):
+        game = make_game()
+        if results is None:
+            results = {game.player1: 0, game.player2: 0, None: 0}
+        winner = play_game(game, {game.player1: agent1, game.player2: agent2}, on_move)
+        results[winner] += 1
+        if on_game_over is not None:
+            on_game_over(game, winner)
+    return results
@@ -0,0 +1,50 @@
+#action selection for a batch of states
+#
+# values and legal are (N, actions) arrays: Q-values (or any scores) and a
+# bool mask of the playable actions, every state needs one legal action at
+# least. Illegal actions are never picked, so there is nothing to retry.
+# Ties between the best legal actions go to the lowest action with
+# ties='first' or to a uniformly random one with ties='random'. All randomness
+# comes from the numpy Generator passed in (the seeded rng of ttt_batch and
+# c4batch), so a seed gives the same choices every run.
+import numpy as np
+
+TIES = ('first', 'random')
+
+
+def random_actions(legal, rng):
+    # a uniformly random legal action per state
+    scores = rng.random(legal.shape)
+    scores[~legal] = -1.0
+    return scores.argmax(axis=1)
+
+
+def greedy(values, legal, rng=None, ties='first'):
+    # masked argmax
+    if ties not in TIES:
+        raise ValueError(f"unknown tie-breaking {ties!r}, use one of {TIES}")
+    masked = np.where(legal, values, -np.inf)
+    if ties == 'first':
+        return masked.argmax(axis=1)
+    scores = rng.random(masked.shape)
+    scores[masked < masked.max(axis=1, keepdims=True)] = -1.0
+    return scores.argmax(axis=1)
+
+
+def epsilon_greedy(values, legal, epsilon, rng, ties='random'):
+    # a random legal action with probability epsilon, the greedy one otherwise
+    actions = greedy(values, legal, rng, ties)
+    explore = rng.random(len(actions)) < epsilon
+    if explore.any():
+        actions[explore] = random_actions(legal[explore], rng)
+    return actions
+
+
+def softmax(values, legal, temperature, rng):
+    # sample legal actions with probability proportional to exp(value / temperature)
+    logits = np.where(legal, values / temperature, -np.inf)
+    weights = np.exp(logits - logits.max(axis=1, keepdims=True))
+    cumulative = weights.cumsum(axis=1)
+    draws = rng.random((len(weights), 1)) * cumulative[:, -1:]
+    # the first action whose cumulative weight passes the draw, never a zero weight one
+    return (cumulative > draws).argmax(axis=1)
@@ -0,0 +1,89 @@
+#binary Q-table files: a header, the key array and the value matrix
+#
+#   python3 -m gamecore.qfile <ttt|c4> <q_table.pickle> [q_table.qtab] [--force]
+#
+# the converter does not replace an existing .qtab file without --force.
+#
+# layout, little endian: magic, version, actions per key, numpy dtype of the
+# keys and the number of entries, then the keys and the (entries, actions)
+# float32 values, each starting on an 8 byte boundary. Reading maps the file
+# read-only with numpy.memmap, so loading copies nothing and every process
+# using the same file shares one copy in the page cache. Writes go to a
+# temporary file that then replaces the old one, so a checkpoint never leaves
+# a half written table behind and processes that mapped the old file keep it.
+import os
+import struct
+import sys
+import numpy as np
+
+MAGIC = b'QTAB'
+VERSION = 1
+HEADER = struct.Struct('<4sHH8sQ')  # magic, version, actions, key dtype, entries
+ALIGN = 8
+
+
+def aligned(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write_q_file(filename, keys, values):
+    # keys: (N,) array, values: (N, actions) Q-values
+    keys = np.ascontiguousarray(keys)
+    keys = keys.astype(keys.dtype.newbyteorder('<'))
+    values = np.ascontiguousarray(values, dtype='<f4')
+    if values.ndim != 2 or len(values) != len(keys):
+        raise ValueError(f"{len(keys)} keys do not match values of shape {values.shape}")
+    temp = filename + '.tmp'
+    with open(temp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, values.shape[1], keys.dtype.str.encode(), len(keys)))
+        f.write(b'\0' * (aligned(f.tell()) - f.tell()))
+        f.write(keys.tobytes())
+        f.write(b'\0' * (aligned(f.tell()) - f.tell()))
+        f.write(values.tobytes())
+    os.replace(temp, filename)
+
+
+def read_q_file(filename, mmap=True):
+    # (keys, values) of a file written by write_q_file, read-only memmaps
+    # unless mmap is False
+    with open(filename, 'rb') as f:
+        magic, version, actions, key_dtype, entries = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{filename} is not a version {VERSION} Q-table file")
+    key_dtype = np.dtype(key_dtype.rstrip(b'\0').decode())
+    keys_offset = aligned(HEADER.size)
+    values_offset = aligned(keys_offset + entries * key_dtype.itemsize)
+    if entries == 0:
+        return np.zeros(0, dtype=key_dtype), np.zeros((0, actions), dtype=np.float32)
+    if mmap:
+        keys = np.memmap(filename, dtype=key_dtype, mode='r', offset=keys_offset, shape=(entries,))
+        values = np.memmap(filename, dtype='<f4', mode='r', offset=values_offset, shape=(entries, actions))
+        return keys, values
+    keys = np.fromfile(filename, dtype=key_dtype, count=entries, offset=keys_offset)
+    values = np.fromfile(filename, dtype='<f4', count=entries * actions, offset=values_offset)
+    return keys, values.reshape(entries, actions)
+
+
+def main():
+    # convert a q_table.pickle of either game
+    args = [arg for arg in sys.argv[1:] if arg != '--force']
+    force = len(args) < len(sys.argv) - 1
+    if len(args) < 2 or args[0] not in ('ttt', 'c4'):
+        print("usage: python3 -m gamecore.qfile <ttt|c4> <q_table.pickle> [q_table.qtab] [--force]")
+        return
+    import gamecore  # noqa: F401 (puts the game folders on the path)
+    if args[0] == 'ttt':
+        import ttt_agents as agents
+    else:
+        import c4agents as agents
+    source = args[1]
+    target = args[2] if len(args) > 2 else os.path.splitext(source)[0] + '.qtab'
+    if os.path.exists(target) and not force:
+        print(f"{target} already exists, pass --force to replace it")
+        return
+    q_table = agents.load_q_table(source)
+    agents.save_q_table(q_table, target)
+    print(f"{len(q_table)} positions written to {target} ({os.path.getsize(target)} bytes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#headless game runner, no tkinter needed
+#
+#   python3 -m gamecore.runner <ttt|c4> <agent1> <agent2> [games]
+#
+# agent1 moves first. Agents: random, basic, minimax, alphabeta, qlearn,
+# table (tic tac toe only), linear, mcts and parallel (connect4 only).
+import sys
+import time
+from gamecore.engine import play_games
+from ttt_core import TicTacToeGame
+from c4board import Connect4
+import ttt_agents
+import c4agents
+
+
+def make_ttt_agent(name):
+    if name == 'random':
+        return ttt_agents.RandomAgent()
+    if name == 'basic':
+        return ttt_agents.BasicAgent()
+    if name == 'minimax':
+        return ttt_agents.MinimaxAgent(use_table=False, pruning=False)
+    if name == 'alphabeta':
+        return ttt_agents.MinimaxAgent(use_table=False, pruning=True)
+    if name == 'table':
+        return ttt_agents.MinimaxAgent(use_table=True)
+    if name == 'qlearn':
+        return ttt_agents.QLearningAgent(ttt_agents.load_q_table(), learn=False)
+    raise ValueError(f"unknown tic tac toe agent {name!r}")
+
+
+def make_c4_agent(name):
+    if name == 'random':
+        return c4agents.RandomAgent()
+    if name == 'basic':
+        return c4agents.BasicAgent()
+    if name == 'minimax':
+        return c4agents.MinimaxAgent()
+    if name == 'alphabeta':
+        return c4agents.AlphaBetaAgent()
+    if name == 'qlearn':
+        return c4agents.QLearningAgent(c4agents.load_q_table(mapped=True), learn=False)
+    if name == 'linear':
+        return c4agents.LinearQAgent()
+    if name == 'mcts':
+        return c4agents.MCTSAgent(rollout='basic')
+    if name == 'parallel':
+        return c4agents.ParallelAgent()
+    raise ValueError(f"unknown connect4 agent {name!r}")
+
+
+GAMES = {
+    'ttt': (TicTacToeGame, make_ttt_agent),
+    'c4': (Connect4, make_c4_agent),
+}
+
+
+def main():
+    if len(sys.argv) < 4 or sys.argv[1] not in GAMES:
+        print("usage: python3 -m gamecore.runner <ttt|c4> <agent1> <agent2> [games]")
+        return
+    make_game, make_agent = GAMES[sys.argv[1]]
+    agent1, agent2 = make_agent(sys.argv[2]), make_agent(sys.argv[3])
+    games = int(sys.argv[4]) if len(sys.argv) > 4 else 100
+    start_time = time.time()
+    results = play_games(make_game, agent1, agent2, games)
+    elapsed = time.time() - start_time
+    player1, player2 = [player for player in results if player is not None]
+    print(f"{sys.argv[2]} ({player1}) wins: {results[player1]}, {sys.argv[3]} ({player2}) wins: {results[player2]}, "
+          f"draws: {results[None]}, {games} games in {elapsed:.2f} seconds")
+    for name, agent in ((sys.argv[2], agent1), (sys.argv[3], agent2)):
+        if agent.move_count:
+            print(f"Average {name} move runtime: {agent.total_time / agent.move_count:.6f} seconds")
+
+
+if __name__ == "__main__":
+    main()
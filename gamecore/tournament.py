@@ -0,0 +1,100 @@
+#AI vs AI tournament spread over a process pool
+#
+#   python3 -m gamecore.tournament <ttt|c4> <agent1> <agent2> [games] [workers] [csv file]
+#
+# games are split into chunks, every chunk reseeds random and numpy with
+# seed + chunk index, so a tournament gives the same games whatever the number
+# of workers (as long as the agents do not learn between games). Each worker
+# builds its own agents once and keeps them (and their caches) for all its chunks.
+import csv
+import multiprocessing
+import os
+import random
+import sys
+import time
+import numpy as np
+from gamecore.engine import play_games
+from gamecore.runner import GAMES
+
+SEED = 0
+CHUNK_GAMES = 100  # smaller chunks balance the load, larger ones cost less overhead
+
+_worker = {}
+
+
+def init_worker(game_name, agent1_name, agent2_name):
+    make_game, make_agent = GAMES[game_name]
+    _worker['make_game'] = make_game
+    _worker['agents'] = (make_agent(agent1_name), make_agent(agent2_name))
+
+
+def play_chunk(task):
+    # (agent1 wins, agent2 wins, draws, [move time total, moves] per agent)
+    index, games, seed = task
+    random.seed(seed + index)
+    np.random.seed((seed + index) % 2 ** 32)
+    agent1, agent2 = _worker['agents']
+    for agent in (agent1, agent2):
+        agent.total_time, agent.move_count = 0.0, 0
+    results = play_games(_worker['make_game'], agent1, agent2, games)
+    wins1, wins2 = [results[player] for player in results if player is not None]
+    timing = [(agent.total_time, agent.move_count) for agent in (agent1, agent2)]
+    return wins1, wins2, results[None], timing
+
+
+def chunks(games, seed=SEED):
+    return [(index, min(CHUNK_GAMES, games - start), seed)
+            for index, start in enumerate(range(0, games, CHUNK_GAMES))]
+
+
+def run_tournament(game_name, agent1_name, agent2_name, games, workers=None, seed=SEED):
+    # totals over all games, agent1 always moves first
+    workers = workers or os.cpu_count() or 1
+    totals = {'wins': 0, 'losses': 0, 'draws': 0, 'times': [0.0, 0.0], 'moves': [0, 0]}
+    tasks = chunks(games, seed)
+    if workers == 1:
+        init_worker(game_name, agent1_name, agent2_name)
+        chunk_results = map(play_chunk, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers, init_worker, (game_name, agent1_name, agent2_name))
+        chunk_results = pool.imap_unordered(play_chunk, tasks)
+    try:
+        for wins1, wins2, draws, timing in chunk_results:
+            totals['wins'] += wins1
+            totals['losses'] += wins2
+            totals['draws'] += draws
+            for i, (total, moves) in enumerate(timing):
+                totals['times'][i] += total
+                totals['moves'][i] += moves
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return totals
+
+
+def main():
+    if len(sys.argv) < 4 or sys.argv[1] not in GAMES:
+        print("usage: python3 -m gamecore.tournament <ttt|c4> <agent1> <agent2> [games] [workers] [csv file]")
+        return
+    game_name, agent1_name, agent2_name = sys.argv[1:4]
+    games = int(sys.argv[4]) if len(sys.argv) > 4 else 1000
+    workers = int(sys.argv[5]) if len(sys.argv) > 5 else None
+    start_time = time.time()
+    totals = run_tournament(game_name, agent1_name, agent2_name, games, workers)
+    elapsed = time.time() - start_time
+    print(f"{agent1_name} vs {agent2_name}: {totals['wins']} wins, {totals['losses']} losses, "
+          f"{totals['draws']} draws, {games} games in {elapsed:.2f} seconds ({games / elapsed:.0f} games/s)")
+    for name, total, moves in zip((agent1_name, agent2_name), totals['times'], totals['moves']):
+        if moves:
+            print(f"Average {name} move runtime: {total / moves:.6f} seconds over {moves} moves")
+    if len(sys.argv) > 6:
+        with open(sys.argv[6], mode='w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['Player 1 Wins', 'Player 2 Wins', 'Draws'])
+            writer.writerow([totals['wins'], totals['losses'], totals['draws']])
+
+
+if __name__ == "__main__":
+    main()
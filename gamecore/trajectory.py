@@ -0,0 +1,60 @@
+#episode buffer of the Q-learning agents
+#
+# an agent records (state, action) for each of its own moves. The rest of a
+# transition follows from the order of the moves: the next state of a move is
+# the state at the agent's following turn (the opponent's reply is part of the
+# environment), the last move ends the game and is the only one rewarded.
+# replay() walks the episode backwards once at the end of the game, so the
+# final reward reaches the opening move in the same episode instead of moving
+# back one step per game.
+#
+# states and actions are whatever the Q-table takes: ttt_qtable.QTable and
+# c4qtable.QStore both provide update(state, action, target, learning_rate)
+# and max_value(state, actions). The legal actions of every state are recorded
+# with it, so a TD target only bootstraps from moves that can be played: the
+# values of occupied squares and full columns are never updated and stay 0.
+
+
+class Trajectory:
+    def __init__(self):
+        self.states = []
+        self.actions = []
+        self.legal = []
+
+    def record(self, state, action, legal=None):
+        # legal: the actions playable in state, None for all of them
+        self.states.append(state)
+        self.actions.append(action)
+        self.legal.append(legal)
+
+    def clear(self):
+        self.states = []
+        self.actions = []
+        self.legal = []
+
+    def __len__(self):
+        return len(self.states)
+
+    def transitions(self, final_reward):
+        # (state, action, reward, next_state, next_legal) per move, next_state is None for the last one
+        last = len(self.states) - 1
+        for i, (state, action) in enumerate(zip(self.states, self.actions)):
+            if i == last:
+                yield state, action, final_reward, None, None
+            else:
+                yield state, action, 0.0, self.states[i + 1], self.legal[i + 1]
+
+    def replay(self, q_table, final_reward, learning_rate, discount_factor, monte_carlo=False):
+        # one backward pass of TD(0) updates, or of Monte-Carlo updates towards
+        # the discounted return, then clears the buffer
+        episode_return = 0.0
+        for state, action, reward, next_state, next_legal in reversed(list(self.transitions(final_reward))):
+            if monte_carlo:
+                episode_return = reward + discount_factor * episode_return
+                target = episode_return
+            elif next_state is None:
+                target = reward
+            else:
+                target = reward + discount_factor * q_table.max_value(next_state, next_legal)
+            q_table.update(state, action, target, learning_rate)
+        self.clear()
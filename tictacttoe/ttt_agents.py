@@ -0,0 +1,169 @@
+#tic tac toe players without any GUI, used by the scripts and gamecore.runner
+#
+# an agent picks a square for game.current_player with select_move(game) and
+# gets game_over(game, winner) once the game has ended (winner is None on a tie).
+import os
+import pickle
+import random
+from ttt_table import LINES, load_table
+from ttt_memo import MEMO
+from ttt_symmetry import canonicalize_q_table
+from ttt_qtable import QTable
+from gamecore.qfile import read_q_file, write_q_file
+from gamecore.trajectory import Trajectory
+
+Q_TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'q_table.qtab')
+
+
+class Agent:
+    def __init__(self):
+        self.total_time = 0.0  # time spent in select_move, kept by gamecore.engine
+        self.move_count = 0
+
+    def select_move(self, game):
+        raise NotImplementedError
+
+    def game_over(self, game, winner):
+        pass
+
+
+class RandomAgent(Agent):
+    def select_move(self, game):
+        return random.choice(game.available_moves())
+
+
+class BasicAgent(Agent):
+    # win if possible, otherwise block the opponent, otherwise play randomly
+    def select_move(self, game):
+        player = game.current_player
+        opponent = game.player2 if player == game.player1 else game.player1
+        for move in game.available_moves():
+            if game.is_winning_move(move, player):
+                return move
+        for move in game.available_moves():
+            if game.is_winning_move(move, opponent):
+                return move
+        return random.choice(game.available_moves())
+
+
+class MinimaxAgent(Agent):
+    # optimal play, looked up in ttt_table or searched with the shared MEMO.
+    # Scores are from X's point of view like the table: 10 - marks for an X win.
+    def __init__(self, use_table=True, pruning=True):
+        super().__init__()
+        self.use_table = use_table
+        self.pruning = pruning  # alpha-beta pruning for the search
+        self.game_table = load_table() if use_table else None
+
+    def select_move(self, game):
+        if self.use_table:
+            return self.game_table.best_move(game.board)
+        board = list(game.board)
+        player = game.current_player
+        maximizing = player == game.player1
+        best_score, best_move = None, None
+        for move in game.available_moves():
+            board[move] = player
+            score = self.minimax(board, not maximizing)
+            board[move] = ' '
+            if best_score is None or (score > best_score if maximizing else score < best_score):
+                best_score, best_move = score, move
+        return best_move
+
+    def minimax(self, board, is_maximizing, alpha=-float('inf'), beta=float('inf')):
+        # results are shared through MEMO across moves and games
+        key = MEMO.key(board, is_maximizing)
+        score = MEMO.lookup(key, alpha, beta)
+        if score is None:
+            score = self.search(board, is_maximizing, alpha, beta)
+            MEMO.store(key, score, alpha, beta)
+        return score
+
+    def search(self, board, is_maximizing, alpha, beta):
+        empty = board.count(' ')
+        for a, b, c in LINES:
+            if board[a] == board[b] == board[c] != ' ':
+                return (1 + empty) if board[a] == 'X' else -(1 + empty)
+        if not empty:
+            return 0
+
+        mark = 'X' if is_maximizing else 'O'
+        best_score = -float('inf') if is_maximizing else float('inf')
+        for move in range(9):
+            if board[move] != ' ':
+                continue
+            board[move] = mark
+            score = self.minimax(board, not is_maximizing, alpha, beta)
+            board[move] = ' '
+            if is_maximizing:
+                best_score = max(score, best_score)
+                alpha = max(alpha, score) if self.pruning else alpha
+            else:
+                best_score = min(score, best_score)
+                beta = min(beta, score) if self.pruning else beta
+            if alpha >= beta:
+                break
+        return best_score
+
+
+class QLearningAgent(Agent):
+    # learn=True records the moves of every game and replays them backwards
+    # into the Q-table once the game is over (see gamecore.trajectory).
+    # learn=False only exploits the table. Either way only free squares are played.
+    def __init__(self, q_table=None, epsilon=0.1, learn=True, learning_rate=0.1, discount_factor=0.9,
+                 monte_carlo=False):
+        super().__init__()
+        self.q_table = q_table if q_table is not None else QTable()
+        self.epsilon = epsilon  # Exploration rate
+        self.learn = learn
+        self.learning_rate = learning_rate
+        self.discount_factor = discount_factor
+        self.monte_carlo = monte_carlo  # replay towards the return instead of TD targets
+        self.trajectories = {}  # player -> Trajectory, two of them in self-play
+
+    def select_move(self, game):
+        # symmetric boards share one canonical Q-table row
+        q_values = self.q_table.get(game.board).tolist()
+
+        # Explore or exploit
+        if random.random() < self.epsilon:
+            move = random.choice(game.available_moves())
+        else:
+            move = self.choose_best_move(game, q_values)
+        if self.learn:
+            trajectory = self.trajectories.setdefault(game.current_player, Trajectory())
+            trajectory.record(''.join(game.board), move, game.available_moves())
+        return move
+
+    def choose_best_move(self, game, q_values):
+        # Choose the best available move based on Q-values
+        moves = game.available_moves()
+        max_q_value = max(q_values[i] for i in moves)
+        best_moves = [i for i in moves if q_values[i] == max_q_value]
+        return random.choice(best_moves)
+
+    def game_over(self, game, winner):
+        for player, trajectory in self.trajectories.items():
+            trajectory.replay(self.q_table, self.reward(player, winner), self.learning_rate,
+                              self.discount_factor, self.monte_carlo)
+
+    def reward(self, player, winner):
+        if winner is None:
+            return 0  # Draw
+        return 1 if winner == player else -1  # Win or lose
+
+
+def load_q_table(filename=Q_TABLE_FILE):
+    # a gamecore.qfile file, or a pickle of {board: 9 Q-values} from older versions
+    try:
+        if filename.endswith('.pickle'):
+            with open(filename, 'rb') as f:
+                print("pickle file loaded")
+                return QTable.from_dict(canonicalize_q_table(pickle.load(f)))
+        return QTable.from_arrays(*read_q_file(filename))
+    except FileNotFoundError:
+        return QTable()
+
+
+def save_q_table(q_table, filename=Q_TABLE_FILE):
+    write_q_file(filename, *q_table.to_arrays())
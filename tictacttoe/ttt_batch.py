@@ -0,0 +1,136 @@
+#tic tac toe games played in lockstep on NumPy arrays
+#
+# N boards are an (N, 9) int8 array using the ttt_table digits: 0 empty,
+# 1 X and 2 O. Every step asks the policy of the side to move for one square on
+# all unfinished boards at once, so win checks, legal masks and the basic
+# opponent cost a handful of array operations per move instead of a Python
+# loop per game.
+import os
+import sys
+import time
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from ttt_table import LINES, load_table
+from gamecore.policy import random_actions
+
+EMPTY = 0
+X = 1
+O = 2
+LINE_INDEX = np.array(LINES)  # (8, 3)
+LINE_SQUARES = np.zeros((8, 3, 9), dtype=np.int8)  # one-hot square of every line cell
+LINE_SQUARES[np.arange(8)[:, None], np.arange(3)[None, :], LINE_INDEX] = 1
+POWERS = 3 ** np.arange(8, -1, -1)  # base-3 code of ttt_table.encode
+
+
+def new_boards(n):
+    return np.zeros((n, 9), dtype=np.int8)
+
+
+def legal_mask(boards):
+    return boards == EMPTY
+
+
+def encode(boards):
+    return boards.astype(np.int64) @ POWERS
+
+
+def winners(boards):
+    # (N,) int8: X or O for won boards, 0 otherwise
+    lines = boards[:, LINE_INDEX]  # (N, 8, 3)
+    won = (lines[:, :, 0] != EMPTY) & (lines[:, :, 0] == lines[:, :, 1]) & (lines[:, :, 1] == lines[:, :, 2])
+    result = np.zeros(len(boards), dtype=np.int8)
+    rows, line = np.nonzero(won)
+    result[rows] = lines[rows, line, 0]
+    return result
+
+
+def completing_squares(boards, player):
+    # (N, 9) bool: empty squares that would give `player` three in a row
+    lines = boards[:, LINE_INDEX]
+    empty = lines == EMPTY
+    two = ((lines == player).sum(axis=2) == 2) & (empty.sum(axis=2) == 1)
+    cells = (empty & two[:, :, None]).reshape(len(boards), 24)
+    return (cells.astype(np.int8) @ LINE_SQUARES.reshape(24, 9)) > 0
+
+
+def first_square(mask):
+    # lowest True square of every row, -1 if there is none
+    return np.where(mask.any(axis=1), mask.argmax(axis=1), -1)
+
+
+def random_moves(boards, player, rng):
+    # a uniformly random empty square for every board
+    return random_actions(boards == EMPTY, rng)
+
+
+def basic_moves(boards, player, rng):
+    # select_move_for_O on every board: win, otherwise block, otherwise random
+    moves = random_moves(boards, player, rng)
+    block = first_square(completing_squares(boards, X + O - player))
+    moves = np.where(block >= 0, block, moves)
+    win = first_square(completing_squares(boards, player))
+    return np.where(win >= 0, win, moves)
+
+
+def table_policy(table=None):
+    # perfect play from ttt_table, the lowest optimal square like GameTable.best_move
+    table = table if table is not None else load_table()
+    best = np.frombuffer(table.best_moves_mask, dtype=np.uint16).astype(np.int64)
+
+    def table_moves(boards, player, rng):
+        mask = best[encode(boards)]
+        return np.log2(mask & -mask).astype(np.int64)
+
+    return table_moves
+
+
+class TicTacToeBatch:
+    def __init__(self, n, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.boards = new_boards(n)
+        self.winner = np.zeros(n, dtype=np.int8)
+        self.done = np.zeros(n, dtype=bool)
+        self.player = X  # every board has the same number of marks
+        self.history = []  # (active board indices, boards before the move, moves, player) per step
+
+    def step(self, policies, record=False):
+        # one move on every unfinished board, policies maps X and O to functions
+        active = np.flatnonzero(~self.done)
+        boards = self.boards[active]
+        moves = policies[self.player](boards, self.player, self.rng)
+        if record:
+            self.history.append((active, boards.copy(), moves, self.player))
+        boards[np.arange(len(active)), moves] = self.player
+        self.boards[active] = boards
+        won = winners(boards)
+        self.winner[active] = won
+        self.done[active] = (won != 0) | ~(boards == EMPTY).any(axis=1)
+        self.player = X + O - self.player
+
+    def play(self, policies, record=False):
+        while not self.done.all():
+            self.step(policies, record)
+        return self.winner
+
+
+def play_batch(x_policy, o_policy, n, seed=None):
+    # winners of n games (X, O or 0 for a tie)
+    return TicTacToeBatch(n, seed).play({X: x_policy, O: o_policy})
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    table = table_policy()
+    for name, x_policy, o_policy in (('basic vs random', basic_moves, random_moves),
+                                     ('random vs basic', random_moves, basic_moves),
+                                     ('minimax vs basic', table, basic_moves)):
+        start_time = time.time()
+        winner = play_batch(x_policy, o_policy, n, seed=0)
+        elapsed = time.time() - start_time
+        print(f"{name}: X wins {np.count_nonzero(winner == X)}, O wins {np.count_nonzero(winner == O)}, "
+              f"ties {np.count_nonzero(winner == EMPTY)}, {n} games in {elapsed:.2f} seconds "
+              f"({n / elapsed * 60:,.0f} games/minute)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#tic tac toe rules without any GUI, shared by the scripts and gamecore.runner
+#
+# the board is a list of 9 marks (' ', 'X', 'O'), squares numbered 0-8 row by
+# row. X always moves first. make_move() does not switch the player, the caller
+# checks for a winner first, the same way as the connect4 board.
+from ttt_table import LINES
+
+
+class TicTacToeGame:
+    def __init__(self):
+        self.player1 = 'X'
+        self.player2 = 'O'
+        self.current_player = self.player1
+        self.game_over = False
+        self.board = [' '] * 9
+        self.moves = []
+
+    def copy(self):
+        other = TicTacToeGame.__new__(TicTacToeGame)
+        other.__dict__.update(self.__dict__)
+        other.board = list(self.board)
+        other.moves = list(self.moves)
+        return other
+
+    def reset(self):
+        self.__init__()
+
+    def available_moves(self):
+        return [i for i, mark in enumerate(self.board) if mark == ' ']
+
+    def valid_moves(self):
+        return self.available_moves()
+
+    def can_play(self, move):
+        return move is not None and 0 <= move < 9 and self.board[move] == ' '
+
+    def make_move(self, move):
+        if self.game_over or not self.can_play(move):
+            return False
+        self.board[move] = self.current_player
+        self.moves.append(move)
+        return True
+
+    def undo(self):
+        move = self.moves.pop()
+        self.board[move] = ' '
+        return move
+
+    def check_winner(self, player=None):
+        # True if `player` (or anyone when player is None) has three in a row
+        for a, b, c in LINES:
+            if self.board[a] == self.board[b] == self.board[c] != ' ':
+                if player is None or self.board[a] == player:
+                    return True
+        return False
+
+    def is_winning_move(self, move, player):
+        if not self.can_play(move):
+            return False
+        self.board[move] = player
+        won = self.check_winner(player)
+        self.board[move] = ' '
+        return won
+
+    def is_board_full(self):
+        return ' ' not in self.board
+
+    def switch_player(self):
+        if self.current_player == self.player1:
+            self.current_player = self.player2
+        else:
+            self.current_player = self.player1
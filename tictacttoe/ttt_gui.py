@@ -0,0 +1,26 @@
+#tkinter view of tic tac toe games played by two agents
+#
+# the games run in gamecore.engine, the window only shows the board.
+import tkinter as tk
+
+
+class TicTacToeView:
+    def __init__(self, master):
+        self.master = master
+        self.master.title("Tic Tac Toe")
+        self.create_board_gui()
+
+    def create_board_gui(self):
+        self.labels = []
+        for i in range(3):
+            row_labels = []
+            for j in range(3):
+                label = tk.Label(self.master, text=' ', font=('Arial', 20), width=5, height=2, relief='raised')
+                label.grid(row=i, column=j, padx=5, pady=5)
+                row_labels.append(label)
+            self.labels.append(row_labels)
+
+    def update_board_gui(self, game):
+        for i in range(3):
+            for j in range(3):
+                self.labels[i][j].config(text=game.board[i*3 + j])
@@ -0,0 +1,83 @@
+#minimax cache shared by every tic tac toe game in the process
+#
+# entries are keyed by the canonical board (see ttt_symmetry) plus the side
+# to move and hold (score, bound), so the alpha-beta searches can reuse
+# results found with a different window. maxsize=None keeps every entry,
+# otherwise the least recently used ones are evicted.
+import os
+import pickle
+from collections import OrderedDict
+from ttt_symmetry import canonical
+
+EXACT = 0
+LOWER = 1  # score is a lower bound (fail high)
+UPPER = 2  # score is an upper bound (fail low)
+MEMO_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ttt_memo.pickle')
+
+
+class MinimaxMemo:
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, board, is_maximizing):
+        return canonical(board)[0] + ('X' if is_maximizing else 'O')
+
+    def lookup(self, key, alpha=-float('inf'), beta=float('inf')):
+        # cached score if it decides the search in the (alpha, beta) window, else None
+        entry = self.entries.get(key)
+        if entry is not None:
+            score, bound = entry
+            if bound == EXACT or (bound == LOWER and score >= beta) or (bound == UPPER and score <= alpha):
+                self.hits += 1
+                if self.maxsize is not None:
+                    self.entries.move_to_end(key)
+                return score
+        self.misses += 1
+        return None
+
+    def store(self, key, score, alpha=-float('inf'), beta=float('inf')):
+        # alpha and beta are the window the score was searched with
+        if score <= alpha:
+            bound = UPPER
+        elif score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.entries[key] = (score, bound)
+        if self.maxsize is not None:
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def save(self, filename=MEMO_FILE):
+        with open(filename, 'wb') as f:
+            pickle.dump(dict(self.entries), f)
+
+    def load(self, filename=MEMO_FILE):
+        # warm the cache from an earlier run, missing files are ignored
+        try:
+            with open(filename, 'rb') as f:
+                self.entries.update(pickle.load(f))
+        except FileNotFoundError:
+            pass
+
+
+MEMO = MinimaxMemo()
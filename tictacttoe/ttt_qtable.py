@@ -0,0 +1,177 @@
+#tic tac toe Q-table stored in one float32 array
+#
+# every board (all 3^9 mark patterns, so even the odd boards the learning
+# agent looks at stay valid) maps to the row of its canonical board (see
+# ttt_symmetry) and the transform between the two. Rows hold the 9 Q-values in
+# canonical orientation, so a lookup is a dict access for a single board and
+# plain array indexing for a batch of ttt_batch boards. Squares that are
+# equivalent on a symmetric canonical board (the 4 corners of the empty board)
+# share the entry of the smallest of them, SQUARES[row] maps a square to it.
+#
+#   python3 ttt_qtable.py    # checks that equivalent squares share their Q-values
+import itertools
+import os
+import sys
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from ttt_symmetry import TRANSFORMS, INVERSES, square_classes
+from gamecore.policy import greedy, epsilon_greedy, softmax
+
+MARKS = ' XO'  # ttt_table / ttt_batch digits
+SORT_DIGITS = np.array([0, 2, 1])  # ' ' < 'O' < 'X', the string order used by canonical()
+POWERS = 3 ** np.arange(8, -1, -1)
+INVERSE_ARRAY = np.array(INVERSES)
+
+
+def _index():
+    boards = np.array(list(itertools.product(range(3), repeat=9)), dtype=np.int8)  # row i has code i
+    sort_codes = np.stack([SORT_DIGITS[boards[:, perm]] @ POWERS for perm in TRANSFORMS])  # (8, 3^9)
+    transforms = sort_codes.argmin(axis=0)
+    _, first, rows = np.unique(sort_codes.min(axis=0), return_index=True, return_inverse=True)
+    strings = [''.join(board) for board in itertools.product(MARKS, repeat=9)]
+    keys = [''.join([strings[code][i] for i in TRANSFORMS[transforms[code]]]) for code in first]
+    lookup = {board: (int(row), int(t)) for board, row, t in zip(strings, rows, transforms)}
+    return rows.astype(np.int32), transforms.astype(np.int8), keys, lookup
+
+
+ROWS, ROW_TRANSFORMS, CANONICAL_KEYS, LOOKUP = _index()
+STATES = len(CANONICAL_KEYS)
+KEY_ROWS = {key: row for row, key in enumerate(CANONICAL_KEYS)}
+SQUARES = np.array([square_classes(key) for key in CANONICAL_KEYS], dtype=np.intp)  # (STATES, 9)
+
+
+def fold(values):
+    # average the Q-values of equivalent squares, tables saved before SQUARES
+    # hold different values for them (saving writes every square of a class)
+    rows = np.arange(STATES)[:, None]
+    sums = np.zeros_like(values, dtype=np.float64)
+    counts = np.zeros_like(sums)
+    np.add.at(sums, (rows, SQUARES), values)
+    np.add.at(counts, (rows, SQUARES), 1.0)
+    return (np.take_along_axis(sums, SQUARES, axis=1) / np.take_along_axis(counts, SQUARES, axis=1)).astype(np.float32)
+
+
+class QTable:
+    def __init__(self, values=None):
+        self.values = values if values is not None else np.zeros((STATES, 9), dtype=np.float32)
+        self.visits = np.zeros(STATES, dtype=np.int32)  # lookups per row, non-zero rows are "in" the table
+
+    def index(self, board):
+        # (row, transform) of a board given as list or string of marks
+        return LOOKUP[''.join(board)]
+
+    def entries(self, board):
+        # (row, the 9 columns of that row holding the squares of `board`)
+        row, t = LOOKUP[''.join(board)]
+        return row, SQUARES[row][INVERSE_ARRAY[t]]
+
+    def get(self, board):
+        # the 9 Q-values in the orientation of `board`, counts as a visit
+        row, columns = self.entries(board)
+        self.visits[row] += 1
+        return self.values[row][columns]
+
+    def max_value(self, board, moves=None):
+        # highest Q-value of `moves` (squares of `board`), of all 9 squares when None
+        row, columns = self.entries(board)
+        return float(self.values[row, columns if moves is None else columns[moves]].max())
+
+    def update(self, board, move, target, learning_rate):
+        # Q(board, move) += learning_rate * (target - Q(board, move))
+        row, columns = self.entries(board)
+        action = columns[move]
+        self.values[row, action] += learning_rate * (target - self.values[row, action])
+
+    def __len__(self):
+        return int(np.count_nonzero(self.visits))
+
+    def batch_values(self, boards):
+        # (N, 9) Q-values of ttt_batch boards ((N, 9) int8), in board orientation
+        codes = boards.astype(np.int64) @ POWERS
+        rows = ROWS[codes]
+        columns = np.take_along_axis(SQUARES[rows], INVERSE_ARRAY[ROW_TRANSFORMS[codes]], axis=1)
+        return np.take_along_axis(self.values[rows], columns, axis=1)
+
+    def best_moves(self, boards, rng=None):
+        # argmax over the empty squares of every board, ties go to the lowest
+        # square or to a random one when rng is given
+        return greedy(self.batch_values(boards), boards == 0, rng, 'first' if rng is None else 'random')
+
+    def merge(self, other):
+        # copy the rows `other` has visited, like dict.update
+        visited = other.visits > 0
+        self.values[visited] = other.values[visited]
+        self.visits[visited] += other.visits[visited]
+
+    def merge_shards(self, shards):
+        # shards are (values, visits) trained from copies of this table: a
+        # visited row becomes the visit weighted mean of the shards that
+        # visited it, the other rows stay as they are
+        visits = np.stack([shard_visits for _, shard_visits in shards]).astype(np.float64)  # (S, STATES)
+        total = visits.sum(axis=0)
+        seen = total > 0
+        weighted = np.einsum('sr,sra->ra', visits, np.stack([values for values, _ in shards]))
+        self.values[seen] = weighted[seen] / total[seen, None]
+        self.visits += total.astype(np.int32)
+
+    def to_dict(self):
+        # {canonical key: 9 Q-values} for the visited rows, the q_table.pickle format
+        return {CANONICAL_KEYS[row]: self.values[row, SQUARES[row]].tolist() for row in np.flatnonzero(self.visits)}
+
+    @classmethod
+    def from_dict(cls, q_table):
+        # q_table is keyed by canonical boards, see ttt_symmetry.canonicalize_q_table
+        table = cls()
+        for key, values in q_table.items():
+            row = KEY_ROWS[key]
+            table.values[row] = values
+            table.visits[row] = max(table.visits[row], 1)
+        table.values = fold(table.values)
+        return table
+
+    def to_arrays(self):
+        # (keys, values) of the visited rows for gamecore.qfile, keys are 9 byte canonical boards
+        rows = np.flatnonzero(self.visits)
+        keys = np.array([CANONICAL_KEYS[row] for row in rows], dtype='S9')
+        return keys, np.take_along_axis(self.values[rows], SQUARES[rows], axis=1)  # every square written
+
+    @classmethod
+    def from_arrays(cls, keys, values):
+        table = cls()
+        rows = np.array([KEY_ROWS[key.decode()] for key in keys], dtype=np.int64)
+        table.values[rows] = values
+        table.visits[rows] = 1
+        table.values = fold(table.values)
+        return table
+
+
+def q_policy(q_table, epsilon=0.0, ties='random', temperature=None):
+    # ttt_batch policy: epsilon-greedy over the empty squares, or softmax
+    # sampling when a temperature is given
+    def q_moves(boards, player, rng):
+        values = q_table.batch_values(boards)
+        if temperature is not None:
+            return softmax(values, boards == 0, temperature, rng)
+        return epsilon_greedy(values, boards == 0, epsilon, rng, ties)
+
+    return q_moves
+
+
+def main():
+    # check that equivalent squares share one Q-value: random updates on
+    # symmetric boards and the stored table must give equal corners and edges
+    from ttt_agents import load_q_table
+    rng = np.random.default_rng(0)
+    random_table = QTable()
+    for name, table in (('random updates', random_table), ('q_table.qtab', load_q_table())):
+        for board in (' ' * 9, '    X    ', '    O    '):
+            for _ in range(100 if table is random_table else 0):
+                table.update(board, int(rng.integers(9)), float(rng.normal()), 0.5)
+            values = table.get(board)
+            for squares in ((0, 2, 6, 8), (1, 3, 5, 7)):
+                assert len(set(values[list(squares)].tolist())) == 1, (name, board, values)
+        print(f"{name}: equivalent squares share their Q-values")
+
+
+if __name__ == "__main__":
+    main()
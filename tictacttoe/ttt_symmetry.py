@@ -0,0 +1,87 @@
+#symmetry reduction of tic tac toe boards (the 8 rotations and reflections)
+#
+# a transform is a permutation of the squares: transformed[i] = board[perm[i]].
+# canonical() picks the smallest of the 8 transformed boards as the key and
+# returns the transform used, so moves and 9-entry Q-value lists can be mapped
+# between the real board and the canonical one. A board that some transforms
+# leave unchanged (the empty board, a lone centre mark) also has equivalent
+# squares, square_classes() maps each of them to the smallest one.
+ROTATE = [6, 3, 0, 7, 4, 1, 8, 5, 2]  # quarter turn clockwise
+REFLECT = [2, 1, 0, 5, 4, 3, 8, 7, 6]  # left-right mirror
+
+
+def _compose(first, second):
+    # apply `first`, then `second`
+    return [first[second[i]] for i in range(9)]
+
+
+def _transforms():
+    transforms = []
+    perm = list(range(9))
+    for _ in range(4):
+        transforms.append(perm)
+        transforms.append(_compose(perm, REFLECT))
+        perm = _compose(perm, ROTATE)
+    return transforms
+
+
+TRANSFORMS = _transforms()
+INVERSES = [[perm.index(i) for i in range(9)] for perm in TRANSFORMS]
+
+
+def transform(board, t):
+    perm = TRANSFORMS[t]
+    return [board[perm[i]] for i in range(9)]
+
+
+def canonical(board):
+    # (canonical key, transform index) for a board given as list or string
+    best_key, best_t = None, 0
+    for t, perm in enumerate(TRANSFORMS):
+        key = ''.join([board[perm[i]] for i in range(9)])
+        if best_key is None or key < best_key:
+            best_key, best_t = key, t
+    return best_key, best_t
+
+
+def square_classes(board):
+    # the smallest square equivalent to each square under the transforms that leave board unchanged
+    stabilizer = [perm for perm in TRANSFORMS if all(board[perm[i]] == board[i] for i in range(9))]
+    return [min(perm[i] for perm in stabilizer) for i in range(9)]
+
+
+def to_canonical_action(action, t):
+    return INVERSES[t][action]
+
+
+def from_canonical_action(action, t):
+    return TRANSFORMS[t][action]
+
+
+def to_canonical_values(values, t):
+    perm = TRANSFORMS[t]
+    return [values[perm[i]] for i in range(9)]
+
+
+def from_canonical_values(values, t):
+    inverse = INVERSES[t]
+    return [values[inverse[i]] for i in range(9)]
+
+
+def canonicalize_q_table(q_table):
+    # fold a Q-table keyed by raw boards into canonical keys, averaging symmetric entries
+    merged = {}
+    counts = {}
+    for state, values in q_table.items():
+        key, t = canonical(state)
+        values = to_canonical_values(values, t)
+        if key in merged:
+            merged[key] = [a + b for a, b in zip(merged[key], values)]
+            counts[key] += 1
+        else:
+            merged[key] = values
+            counts[key] = 1
+    for key, n in counts.items():
+        if n > 1:
+            merged[key] = [value / n for value in merged[key]]
+    return merged
@@ -0,0 +1,108 @@
+#precomputed tic tac toe game values for every reachable position
+#
+# a board (list of ' ', 'X', 'O') is indexed by its base-3 code, so every
+# lookup is a single array access. X always moves first. Values are from X's
+# point of view: 10 - number of marks for an X win (faster wins score higher),
+# the negative of that for an O win and 0 for a draw.
+import os
+import pickle
+import time
+from array import array
+
+LINES = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)]
+DIGITS = {' ': 0, 'X': 1, 'O': 2}
+SIZE = 3 ** 9
+UNREACHABLE = -128
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ttt_table.pickle')
+
+
+def encode(board):
+    code = 0
+    for mark in board:
+        code = code * 3 + DIGITS[mark]
+    return code
+
+
+def winner(board):
+    for a, b, c in LINES:
+        if board[a] == board[b] == board[c] != ' ':
+            return board[a]
+    return None
+
+
+class GameTable:
+    def __init__(self, values, best_moves):
+        self.values = values  # array('b'), UNREACHABLE for impossible boards
+        self.best_moves_mask = best_moves  # array('H'), bit i set if move i is optimal
+
+    def value(self, board):
+        return self.values[encode(board)]
+
+    def best_moves(self, board):
+        mask = self.best_moves_mask[encode(board)]
+        return [i for i in range(9) if mask >> i & 1]
+
+    def best_move(self, board):
+        # lowest optimal square, None on finished boards
+        mask = self.best_moves_mask[encode(board)]
+        if not mask:
+            return None
+        return (mask & -mask).bit_length() - 1
+
+    def positions(self):
+        return SIZE - self.values.count(UNREACHABLE)
+
+
+def build_table():
+    values = array('b', [UNREACHABLE]) * SIZE
+    best_moves = array('H', [0]) * SIZE
+    board = [' '] * 9
+
+    def solve(code, marks):
+        if values[code] != UNREACHABLE:
+            return values[code]
+        won = winner(board)
+        if won is not None:
+            values[code] = (10 - marks) if won == 'X' else -(10 - marks)
+            return values[code]
+        if marks == 9:
+            values[code] = 0
+            return 0
+        player = 'X' if marks % 2 == 0 else 'O'
+        scores = {}
+        for move in range(9):
+            if board[move] == ' ':
+                board[move] = player
+                scores[move] = solve(code + DIGITS[player] * 3 ** (8 - move), marks + 1)
+                board[move] = ' '
+        best = max(scores.values()) if player == 'X' else min(scores.values())
+        values[code] = best
+        best_moves[code] = sum(1 << move for move, score in scores.items() if score == best)
+        return best
+
+    solve(0, 0)
+    return GameTable(values, best_moves)
+
+
+def load_table(filename=TABLE_FILE):
+    # build the table once and cache it on disk
+    try:
+        with open(filename, 'rb') as f:
+            values, best_moves = pickle.load(f)
+            return GameTable(values, best_moves)
+    except FileNotFoundError:
+        table = build_table()
+        with open(filename, 'wb') as f:
+            pickle.dump((table.values, table.best_moves_mask), f)
+        return table
+
+
+def main():
+    start_time = time.time()
+    table = build_table()
+    print(f"{table.positions()} positions in {time.time() - start_time:.3f} seconds")
+    print(f"Value of the empty board: {table.value([' '] * 9)}")
+
+
+if __name__ == "__main__":
+    main()